@@ -1,10 +1,41 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+class OrderError(RuntimeError):
+    pass
+
+
+def order_error(response: Any) -> Optional[str]:
+    # OKX reports rejections in the body: top-level code and per-order sCode/sMsg
+    if not isinstance(response, dict):
+        return "empty order response"
+    for item in response.get("data") or []:
+        if isinstance(item, dict) and str(item.get("sCode", "0")) != "0":
+            return str(item.get("sMsg") or f"sCode {item['sCode']}")
+    if str(response.get("code", "0")) != "0":
+        return str(response.get("msg") or f"code {response['code']}")
+    return None
+
+
+@dataclass(frozen=True)
+class Quote:
+    venue: str
+    symbol: str
+    bid: float
+    bid_size: float
+    ask: float
+    ask_size: float
+    ts: float
 
 
 class BaseBroker(ABC):
+    name = "base"
+    taker_fee = 0.001
+
     @abstractmethod
     async def get_balance(self) -> Dict[str, Any]:
         raise NotImplementedError
@@ -16,3 +47,10 @@ class BaseBroker(ABC):
     @abstractmethod
     async def simulate_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_quote(self, symbol: str) -> Quote:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from .base import BaseBroker, Quote
+
+REFERENCE_PRICES: Dict[str, float] = {
+    "BTC-USDT": 65000.0,
+    "ETH-USDT": 3200.0,
+    "SOL-USDT": 150.0,
+    "LTC-USDT": 80.0,
+}
+
+
+class FakeVenue(BaseBroker):
+    def __init__(
+        self,
+        name: str,
+        taker_fee: float = 0.001,
+        spread_bps: float = 2.0,
+        offset_bps: float = 0.0,
+        depth: float = 1.0,
+        latency_ms: float = 5.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.taker_fee = taker_fee
+        self.spread_bps = spread_bps
+        self.offset_bps = offset_bps
+        self.depth = depth
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+
+    async def _delay(self) -> None:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms * self.rng.uniform(0.5, 1.5) / 1000)
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} unavailable")
+
+    async def get_quote(self, symbol: str) -> Quote:
+        await self._delay()
+        mid = REFERENCE_PRICES.get(symbol, 100.0) * (1 + self.offset_bps / 10000)
+        mid *= 1 + self.rng.gauss(0.0, 0.0001)
+        half = mid * self.spread_bps / 20000
+        size = self.depth * self.rng.uniform(0.5, 1.5)
+        return Quote(self.name, symbol, mid - half, size, mid + half, size, time.time())
+
+    async def get_balance(self) -> Dict[str, Any]:
+        await self._delay()
+        return {"code": "0", "data": [{"ccy": "USDT", "availBal": "100000", "cashBal": "100000"}], "venue": self.name}
+
+    async def place_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        await self._delay()
+        order = {**payload, "ordId": uuid.uuid4().hex[:16], "sCode": "0"}
+        return {"code": "0", "data": [order], "venue": self.name, "simulated": True}
+
+    async def simulate_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"code": "0", "data": [payload], "simulated": True, "venue": self.name, "ts": time.time()}
+
+
+FAKE_VENUES: Dict[str, Dict[str, Any]] = {
+    "FAKE_A": {"taker_fee": 0.0008, "spread_bps": 3.0, "offset_bps": 1.0, "depth": 0.8, "latency_ms": 4.0},
+    "FAKE_B": {"taker_fee": 0.0010, "spread_bps": 1.5, "offset_bps": -1.5, "depth": 0.5, "latency_ms": 8.0},
+    "FAKE_C": {"taker_fee": 0.0005, "spread_bps": 5.0, "offset_bps": 0.5, "depth": 2.0, "latency_ms": 15.0, "failure_rate": 0.05},
+}
@@ -5,23 +5,51 @@ import hashlib
 import hmac
 import json
 import time
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import httpx
-
-from ..core.env import env_manager
+from ..core.env import EnvConfig, env_manager
 from ..core.metrics import ORDER_COUNTER
-from .base import BaseBroker
+from .base import BaseBroker, OrderError, Quote, order_error
+
+if TYPE_CHECKING:
+    import httpx
 
 API_BASE = "https://www.okx.com"
 
 
+@dataclass(frozen=True)
+class SigningContext:
+    api_key: str
+    passphrase: str
+    secret: bytes
+    simulated: bool
+
+
 class OkxBroker(BaseBroker):
+    name = "OKX"
+    taker_fee = 0.001
+
     def __init__(self) -> None:
-        self.client = httpx.AsyncClient(base_url=API_BASE, timeout=10.0)
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._signing: Optional[SigningContext] = None
+        env_manager.subscribe(self._invalidate_signing)
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(base_url=env_manager.get("OKX_BASE_URL") or API_BASE, timeout=10.0)
+        return self._client
 
     async def close(self) -> None:
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _invalidate_signing(self, config: EnvConfig) -> None:
+        self._signing = None
 
     def _credentials(self) -> Dict[str, str]:
         mode = env_manager.mode
@@ -32,25 +60,36 @@ class OkxBroker(BaseBroker):
             "passphrase": env_manager.get(f"OKX_API_PASSPHRASE_{suffix}"),
         }
 
-    def _sign(self, timestamp: str, method: str, path: str, body: str, secret: str) -> str:
+    def _signing_context(self) -> SigningContext:
+        if self._signing is None:
+            creds = self._credentials()
+            self._signing = SigningContext(
+                api_key=creds["api_key"],
+                passphrase=creds["passphrase"],
+                secret=creds["secret"].encode(),
+                simulated=env_manager.mode == "PAPER",
+            )
+        return self._signing
+
+    def _sign(self, timestamp: str, method: str, path: str, body: str, secret: bytes) -> str:
         message = f"{timestamp}{method}{path}{body}"
-        mac = hmac.new(secret.encode(), message.encode(), hashlib.sha256)
+        mac = hmac.new(secret, message.encode(), hashlib.sha256)
         return base64.b64encode(mac.digest()).decode()
 
     def _headers(self, method: str, path: str, body: str) -> Dict[str, str]:
-        creds = self._credentials()
-        timestamp = str(time.time())
-        if not creds["api_key"]:
+        signing = self._signing_context()
+        if not signing.api_key:
             return {}
-        sign = self._sign(timestamp, method, path, body, creds["secret"])
+        timestamp = str(time.time())
+        sign = self._sign(timestamp, method, path, body, signing.secret)
         headers = {
-            "OK-ACCESS-KEY": creds["api_key"],
-            "OK-ACCESS-PASSPHRASE": creds["passphrase"],
+            "OK-ACCESS-KEY": signing.api_key,
+            "OK-ACCESS-PASSPHRASE": signing.passphrase,
             "OK-ACCESS-TIMESTAMP": timestamp,
             "OK-ACCESS-SIGN": sign,
             "Content-Type": "application/json",
         }
-        if env_manager.mode == "PAPER":
+        if signing.simulated:
             headers["x-simulated-trading"] = "1"
         return headers
 
@@ -76,13 +115,26 @@ class OkxBroker(BaseBroker):
         return resp
 
     async def place_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        ORDER_COUNTER.labels(side=payload.get("side", "unknown"), type=payload.get("ordType", "unknown")).inc()
+        ORDER_COUNTER.labels(str(payload.get("side", "unknown")), str(payload.get("ordType", "unknown"))).inc()
         try:
             resp = await self._request("POST", "/api/v5/trade/order", payload)
-        except Exception:
-            resp = {"code": "0", "data": [payload], "simulated": True}
+        except Exception as exc:
+            raise OrderError(f"order not sent: {str(exc) or type(exc).__name__}") from exc
+        error = order_error(resp)
+        if error:
+            raise OrderError(f"order rejected: {error}")
         return resp
 
+    async def get_quote(self, symbol: str) -> Quote:
+        response = await self.client.get("/api/v5/market/books", params={"instId": symbol, "sz": "1"})
+        response.raise_for_status()
+        body = response.json()
+        book = (body.get("data") or [{}])[0]
+        if body.get("code") != "0" or not book.get("asks") or not book.get("bids"):
+            raise ValueError(f"no order book for {symbol}: {body.get('msg') or body.get('code')}")
+        ask, bid = book["asks"][0], book["bids"][0]
+        return Quote(self.name, symbol, float(bid[0]), float(bid[1]), float(ask[0]), float(ask[1]), time.time())
+
     async def simulate_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return {"code": "0", "data": [payload], "simulated": True, "ts": time.time()}
 
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..core.env import EnvConfig, env_manager
+from .base import BaseBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE = "OKX"
+LATENCY_ALPHA = 0.2
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 30.0
+LATENCY_REFERENCE_MS = 250.0
+
+
+@dataclass
+class VenueHealth:
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    suspended_until: float = 0.0
+
+    def record(self, latency: float, ok: bool, error: Optional[str] = None) -> None:
+        sample = latency * 1000
+        self.latency_ms = sample if self.latency_ms is None else self.latency_ms + LATENCY_ALPHA * (sample - self.latency_ms)
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.consecutive_failures >= FAILURE_THRESHOLD:
+            self.suspended_until = time.monotonic() + COOLDOWN_SECONDS
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.suspended_until
+
+    @property
+    def score(self) -> float:
+        if not self.available:
+            return 0.0
+        total = self.successes + self.failures
+        reliability = (self.successes + 1) / (total + 2)
+        speed = 1 / (1 + (self.latency_ms or 0.0) / LATENCY_REFERENCE_MS)
+        return reliability * speed
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "score": round(self.score, 4),
+            "available": self.available,
+            "latency_ms": self.latency_ms,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+
+def _okx() -> BaseBroker:
+    from .okx import okx_broker
+
+    return okx_broker
+
+
+def _fake(name: str) -> Callable[[], BaseBroker]:
+    def build() -> BaseBroker:
+        from .fake import FAKE_VENUES, FakeVenue
+
+        return FakeVenue(name, **FAKE_VENUES[name])
+
+    return build
+
+
+class BrokerRegistry:
+    def __init__(self) -> None:
+        self.factories: Dict[str, Callable[[], BaseBroker]] = {}
+        self.instances: Dict[str, BaseBroker] = {}
+        self.health: Dict[str, VenueHealth] = {}
+        self._active = env_manager.config.exchange_active
+        env_manager.subscribe(self._on_config)
+
+    def _on_config(self, config: EnvConfig) -> None:
+        self._active = config.exchange_active
+
+    def register(self, name: str, factory: Callable[[], BaseBroker]) -> None:
+        name = name.upper()
+        self.factories[name] = factory
+        self.instances.pop(name, None)
+
+    def names(self) -> List[str]:
+        return list(self.factories)
+
+    def get(self, name: Optional[str] = None) -> BaseBroker:
+        name = (name or self._active).upper()
+        broker = self.instances.get(name)
+        if broker is None:
+            factory = self.factories.get(name)
+            if factory is None:
+                raise KeyError(f"unknown exchange {name}; registered: {', '.join(self.factories)}")
+            broker = self.instances[name] = factory()
+        return broker
+
+    def active(self) -> BaseBroker:
+        if self._active not in self.factories:
+            logger.warning("EXCHANGE_ACTIVE=%s is not registered, using %s", self._active, DEFAULT_EXCHANGE)
+            return self.get(DEFAULT_EXCHANGE)
+        return self.get(self._active)
+
+    def venues(self, names: Optional[List[str]] = None) -> List[BaseBroker]:
+        return [self.get(name) for name in (names or env_manager.config.router_venues)]
+
+    def health_of(self, name: str) -> VenueHealth:
+        health = self.health.get(name)
+        if health is None:
+            health = self.health[name] = VenueHealth()
+        return health
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "active": self._active,
+            "registered": self.names(),
+            "routing": list(env_manager.config.router_venues),
+            "health": {name: health.snapshot() for name, health in self.health.items()},
+        }
+
+    async def close(self) -> None:
+        for broker in list(self.instances.values()):
+            await broker.close()
+
+
+broker_registry = BrokerRegistry()
+broker_registry.register(DEFAULT_EXCHANGE, _okx)
+for _name in ("FAKE_A", "FAKE_B", "FAKE_C"):
+    broker_registry.register(_name, _fake(_name))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.metrics import ROUTED_ORDER_COUNTER, ROUTER_DECISION_SECONDS, VENUE_LATENCY
+from .base import BaseBroker, Quote, order_error
+from .registry import BrokerRegistry, broker_registry
+
+QUOTE_TIMEOUT_SECONDS = 0.5
+SIZE_DECIMALS = 8
+
+
+@dataclass
+class RouteLeg:
+    venue: str
+    size: float
+    price: float
+    fee: float
+    effective_price: float
+    beyond_top: bool = False
+
+
+@dataclass
+class RoutePlan:
+    symbol: str
+    side: str
+    size: float
+    legs: List[RouteLeg] = field(default_factory=list)
+    avg_effective_price: float = 0.0
+    decision_us: float = 0.0
+    quotes: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def plan_route(symbol: str, side: str, size: float, quotes: Sequence[Quote], fees: Dict[str, float], scores: Dict[str, float]) -> RoutePlan:
+    start = time.perf_counter()
+    buy = side == "buy"
+    candidates = []
+    for quote in quotes:
+        fee = fees.get(quote.venue, 0.0)
+        price, available = (quote.ask, quote.ask_size) if buy else (quote.bid, quote.bid_size)
+        effective = price * (1 + fee) if buy else price * (1 - fee)
+        # cheapest effective price first; healthier venue wins ties
+        candidates.append((effective if buy else -effective, -scores.get(quote.venue, 0.0), quote.venue, price, available, fee, effective))
+    candidates.sort()
+    plan = RoutePlan(symbol, side, size)
+    remaining = size
+    for _, _, venue, price, available, fee, effective in candidates:
+        if remaining <= 0:
+            break
+        take = min(remaining, available)
+        if take <= 0:
+            continue
+        plan.legs.append(RouteLeg(venue, take, price, fee, effective))
+        remaining -= take
+    if remaining > 1e-12 and candidates:
+        # displayed size is top-of-book only; sweep the residual on the best venue
+        best = candidates[0]
+        leg = next((leg for leg in plan.legs if leg.venue == best[2]), None)
+        if leg is None:
+            leg = RouteLeg(best[2], 0.0, best[3], best[5], best[6])
+            plan.legs.insert(0, leg)
+        leg.size += remaining
+        leg.beyond_top = True
+    filled = sum(leg.size for leg in plan.legs)
+    if filled:
+        plan.avg_effective_price = sum(leg.size * leg.effective_price for leg in plan.legs) / filled
+    elapsed = time.perf_counter() - start
+    plan.decision_us = elapsed * 1e6
+    ROUTER_DECISION_SECONDS.observe(elapsed)
+    return plan
+
+
+class SmartOrderRouter:
+    def __init__(self, registry: BrokerRegistry) -> None:
+        self.registry = registry
+
+    async def _timed(self, broker: BaseBroker, op: str, call: Any) -> Tuple[Any, Optional[str]]:
+        health = self.registry.health_of(broker.name)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call, QUOTE_TIMEOUT_SECONDS) if op == "quote" else await call
+            error = order_error(result) if op == "order" else None
+        except Exception as exc:
+            result, error = None, str(exc) or type(exc).__name__
+        latency = time.perf_counter() - start
+        if error:
+            health.record(latency, False, f"{op}: {error}")
+            return None, error
+        health.record(latency, True)
+        VENUE_LATENCY.labels(broker.name, op).observe(latency)
+        return result, None
+
+    async def quotes(self, symbol: str, venues: Optional[List[str]] = None) -> List[Quote]:
+        try:
+            candidates = self.registry.venues(venues)
+        except KeyError as exc:
+            raise ValueError(exc.args[0]) from exc
+        brokers = [broker for broker in candidates if self.registry.health_of(broker.name).available]
+        results = await asyncio.gather(*(self._timed(broker, "quote", broker.get_quote(symbol)) for broker in brokers))
+        return [quote for quote, _ in results if quote is not None]
+
+    async def plan(self, payload: Dict[str, Any], venues: Optional[List[str]] = None) -> RoutePlan:
+        symbol = str(payload.get("instId") or "")
+        side = str(payload.get("side") or "").lower()
+        try:
+            size = float(payload.get("sz") or 0)
+        except (TypeError, ValueError):
+            size = 0.0
+        if not symbol or side not in ("buy", "sell") or size <= 0:
+            raise ValueError("order needs instId, side buy/sell and a positive sz")
+        quotes = await self.quotes(symbol, venues)
+        if not quotes:
+            raise ValueError(f"no venue returned a quote for {symbol}")
+        fees = {quote.venue: self.registry.get(quote.venue).taker_fee for quote in quotes}
+        scores = {quote.venue: self.registry.health_of(quote.venue).score for quote in quotes}
+        plan = plan_route(symbol, side, size, quotes, fees, scores)
+        plan.quotes = [asdict(quote) for quote in quotes]
+        return plan
+
+    async def execute(self, payload: Dict[str, Any], venues: Optional[List[str]] = None, simulate: bool = False) -> Dict[str, Any]:
+        plan = await self.plan(payload, venues)
+
+        async def place(leg: RouteLeg) -> Dict[str, Any]:
+            broker = self.registry.get(leg.venue)
+            order = {**payload, "sz": f"{round(leg.size, SIZE_DECIMALS):.{SIZE_DECIMALS}f}".rstrip("0").rstrip(".")}
+            call = broker.simulate_order(order) if simulate else broker.place_order(order)
+            response, error = await self._timed(broker, "order", call)
+            ROUTED_ORDER_COUNTER.labels(leg.venue, plan.side).inc()
+            return {"venue": leg.venue, "size": leg.size, "ok": error is None, "error": error, "response": response}
+
+        fills = list(await asyncio.gather(*(place(leg) for leg in plan.legs)))
+        # failed legs are reported, not re-routed: the caller decides whether to retry the residual
+        filled = sum(fill["size"] for fill in fills if fill["ok"])
+        unfilled = plan.size - filled
+        status = "filled" if unfilled <= 1e-12 else "partial" if filled else "failed"
+        return {"plan": asdict(plan), "fills": fills, "status": status, "filled": filled, "unfilled": max(unfilled, 0.0)}
+
+
+smart_router = SmartOrderRouter(broker_registry)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .allocator import allocator
-from .cost import cost_manager
+from .cost import Reservation, cost_manager
+from .decision_cache import decision_cache
 from .env import env_manager
 from .metrics import AI_MODEL_COUNTER, EXECUTION_DURATION, ORDER_COUNTER
 from .risk import risk_manager
+from .sentiment import rolling_sentiment
 
 MODEL_ORDER = ["GPT-5", "GPT-5-MINI", "gpt-5-nano"]
 
@@ -30,26 +32,28 @@ class AIEngine:
         self.universe = ["BTC-USDT", "ETH-USDT", "SOL-USDT", "LTC-USDT"]
 
     def _preferred_models(self) -> List[str]:
-        base = env_manager.get("OPENAI_MODEL_TIER", "GPT-5-MINI")
+        base = env_manager.config.model_tier
         if base not in MODEL_ORDER:
             base = "GPT-5-MINI"
         idx = MODEL_ORDER.index(base)
         return MODEL_ORDER[: idx + 1]
 
-    def select_model(self, complexity: int) -> Optional[ModelTier]:
+    def select_model(self, complexity: int, strategy: str = "") -> Optional[Tuple[ModelTier, Reservation]]:
         candidates = self._preferred_models()
         if complexity <= 1 and "gpt-5-nano" in candidates:
             candidates = ["gpt-5-nano"] + [c for c in candidates if c != "gpt-5-nano"]
-        remaining = cost_manager.budget().get("remaining", 0.0)
+        remaining = cost_manager.remaining()
         for name in candidates:
             tier = MODEL_TIERS[name]
             if remaining < tier.cost * 0.5:
                 continue
-            if cost_manager.guard(tier.cost):
-                return tier
+            reservation = cost_manager.reserve(tier.cost, tier.name, strategy)
+            if reservation:
+                return tier, reservation
         cheapest = MODEL_TIERS["gpt-5-nano"]
-        if cost_manager.guard(cheapest.cost):
-            return cheapest
+        reservation = cost_manager.reserve(cheapest.cost, cheapest.name, strategy)
+        if reservation:
+            return cheapest, reservation
         return None
 
     def estimate_complexity(self, strategy: str, context: Dict[str, Any]) -> int:
@@ -63,20 +67,29 @@ class AIEngine:
     async def decide(self, strategy: str, context: Dict[str, Any]) -> Dict[str, Any]:
         complexity = self.estimate_complexity(strategy, context)
         with EXECUTION_DURATION.time():
-            tier = self.select_model(complexity)
-            if not tier:
-                return {
-                    "model": None,
-                    "status": "skipped",
-                    "reason": "budget_exhausted",
-                    "daily_cost": cost_manager.budget(),
-                }
-            AI_MODEL_COUNTER.labels(model=tier.name, decision=strategy).inc()
-            cost_manager.record(tier.cost)
-            total_capital = float(env_manager.get("TOTAL_CAPITAL_USDT", "0") or 0)
+            cached = decision_cache.lookup(strategy, context)
+            tier = MODEL_TIERS.get(cached.model) if cached else None
+            if tier is None:
+                cached = None
+                selection = self.select_model(complexity, strategy)
+                if not selection:
+                    return {
+                        "model": None,
+                        "status": "skipped",
+                        "reason": "budget_exhausted",
+                        "daily_cost": cost_manager.budget(),
+                    }
+                tier, reservation = selection
+                AI_MODEL_COUNTER.labels(tier.name, strategy.lower()).inc()
+                cost_manager.commit(reservation)
+                decision_cache.store(strategy, context, tier.name, tier.cost)
+            total_capital = context.get("capital") or env_manager.config.total_capital_usdt
+            side = context.get("side", "buy")
             allocations = allocator.allocate(context.get("universe", self.universe[:2]), total_capital)
             orders = []
-            from ..broker.okx import okx_broker  # local import
+            from ..broker.registry import broker_registry  # local import
+
+            broker = broker_registry.active()
 
             for allocation in allocations:
                 symbol = allocation["symbol"]
@@ -93,22 +106,23 @@ class AIEngine:
                 order_payload = {
                     "instId": symbol,
                     "tdMode": "cash",
-                    "side": "buy",
+                    "side": side,
                     "ordType": "market",
                     "sz": round(size / 1000, 4),
                 }
-                ORDER_COUNTER.labels(side="buy", type="market").inc()
-                okx_response = await okx_broker.simulate_order(order_payload)
+                ORDER_COUNTER.labels(side, "market").inc()
+                broker_response = await broker.simulate_order(order_payload)
                 risk_manager.register_fill(symbol, pnl=0.0, size_usd=size)
                 orders.append({
                     "symbol": symbol,
                     "size": size,
                     "status": "submitted",
-                    "broker_response": okx_response,
+                    "broker_response": broker_response,
                 })
             return {
                 "model": tier.name,
                 "strategy": strategy,
+                "cache": "hit" if cached else "miss",
                 "orders": orders,
                 "daily_cost": cost_manager.budget(),
                 "universe": context.get("universe", self.universe),
@@ -116,7 +130,7 @@ class AIEngine:
 
     async def execute_autopilot(self) -> Dict[str, Any]:
         strategy = "autopilot"
-        context = {"universe": self.universe}
+        context = {"universe": self.universe, "sentiment": rolling_sentiment.summary(self.universe)}
         decision = await self.decide(strategy, context)
         decision["decision"] = strategy
         return decision
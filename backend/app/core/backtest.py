@@ -1,36 +1,151 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict, List
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 
+from .sentiment_store import sentiment_series
 
-def run_backtest(strategy: str, days: int = 30) -> Dict[str, any]:
+DAY_SECONDS = 86400
+MAX_BARS = 2_000_000
+DOWNSAMPLERS = ("lttb", "minmax")
+
+
+def simulate_equity(
+    strategy: str,
+    days: int = 30,
+    bar_seconds: int = DAY_SECONDS,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
     days = max(3, days)
+    bar_seconds = max(60, int(bar_seconds))
+    bars = min(days * DAY_SECONDS // bar_seconds, MAX_BARS)
+    scale = bar_seconds / DAY_SECONDS
     base_equity = 10000.0
-    timestamps: List[str] = []
-    equity_curve: List[float] = []
-    returns = np.random.default_rng(seed=len(strategy) + days).normal(0.001, 0.01, days)
+    returns = np.random.default_rng(seed=len(strategy) + days).normal(0.001 * scale, 0.01 * np.sqrt(scale), bars)
     if strategy.lower() == "breakout":
-        returns += 0.0005
+        returns += 0.0005 * scale
     elif strategy.lower() == "grid":
         returns *= 0.8
-    equity = base_equity
-    start = datetime.utcnow() - timedelta(days=days)
-    for idx, r in enumerate(returns):
-        equity *= (1 + r)
-        timestamps.append((start + timedelta(days=idx)).isoformat())
-        equity_curve.append(float(equity))
-    total_return = equity_curve[-1] / base_equity - 1
-    sharpe = float(np.mean(returns) / (np.std(returns) + 1e-6) * np.sqrt(252))
-    max_drawdown = float(np.max(np.maximum.accumulate(equity_curve) - equity_curve) / np.max(equity_curve))
+    equity = base_equity * np.cumprod(1 + returns)
+    start_ms = int(time.time() * 1000) - days * DAY_SECONDS * 1000
+    ts_ms = start_ms + np.arange(bars, dtype=np.int64) * (bar_seconds * 1000)
+    total_return = float(equity[-1] / base_equity - 1)
+    sharpe = float(np.mean(returns) / (np.std(returns) + 1e-6) * np.sqrt(252 / scale))
+    max_drawdown = float(np.max(np.maximum.accumulate(equity) - equity) / np.max(equity))
+    kpi = {
+        "total_return": total_return,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+    }
+    return ts_ms, equity, kpi
+
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return x, y
+    xf = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < edges.size else n
+        avg_x = xf[end:next_end].mean() if next_end > end else xf[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (xf[prev] - avg_x) * (y[start:end] - y[prev]) - (xf[prev] - xf[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return x[selected], y[selected]
+
+
+def downsample_minmax(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = x.size
+    if threshold >= n or threshold < 6:
+        return x, y
+    buckets = (threshold - 4) // 2
+    width = n // buckets
+    usable = width * buckets
+    view = y[:usable].reshape(buckets, width)
+    offsets = np.arange(buckets, dtype=np.int64) * width
+    parts = [offsets + np.argmin(view, axis=1), offsets + np.argmax(view, axis=1), np.array([0, n - 1])]
+    if usable < n:
+        tail = y[usable:]
+        parts.append(np.array([usable + np.argmin(tail), usable + np.argmax(tail)]))
+    idx = np.unique(np.concatenate(parts))
+    return x[idx], y[idx]
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    resolution: Optional[int],
+    method: str = "lttb",
+) -> Tuple[np.ndarray, np.ndarray]:
+    if not resolution:
+        return x, y
+    if method == "minmax":
+        return downsample_minmax(x, y, resolution)
+    return downsample_lttb(x, y, resolution)
+
+
+def _sentiment(symbol: str, ts_ms: np.ndarray) -> Dict[str, Any]:
+    aligned = sentiment_series.align(symbol, ts_ms // 1000, resolution="hour")
     return {
+        "symbol": symbol,
+        "mean": aligned["mean"].tolist(),
+        "count": aligned["count"].tolist(),
+    }
+
+
+def run_backtest(
+    strategy: str,
+    days: int = 30,
+    symbol: Optional[str] = None,
+    bar_seconds: int = DAY_SECONDS,
+    resolution: Optional[int] = None,
+    method: str = "lttb",
+    columnar: bool = False,
+) -> Dict[str, Any]:
+    ts_ms, equity, kpi = simulate_equity(strategy, days, bar_seconds)
+    points = ts_ms.size
+    ts_ms, equity = downsample(ts_ms, equity, resolution, method)
+    if columnar:
+        curve: Any = {"ts": ts_ms.tolist(), "value": equity.tolist()}
+    else:
+        curve = [{"ts": ts, "value": value} for ts, value in zip(ts_ms.tolist(), equity.tolist())]
+    result = {
         "strategy": strategy,
-        "equity": [{"ts": ts, "value": eq} for ts, eq in zip(timestamps, equity_curve)],
-        "kpi": {
-            "total_return": total_return,
-            "sharpe": sharpe,
-            "max_drawdown": max_drawdown,
-        },
+        "equity": curve,
+        "points": {"source": points, "returned": int(ts_ms.size)},
+        "kpi": kpi,
+    }
+    if symbol:
+        result["sentiment"] = _sentiment(symbol, ts_ms)
+    return result
+
+
+def run_backtest_binary(
+    strategy: str,
+    days: int = 30,
+    bar_seconds: int = DAY_SECONDS,
+    resolution: Optional[int] = None,
+    method: str = "lttb",
+) -> Tuple[bytes, Dict[str, str]]:
+    ts_ms, equity, kpi = simulate_equity(strategy, days, bar_seconds)
+    points = ts_ms.size
+    ts_ms, equity = downsample(ts_ms, equity, resolution, method)
+    body = ts_ms.astype("<i8").tobytes() + equity.astype("<f8").tobytes()
+    headers = {
+        "X-Equity-Layout": "ts:int64-le,value:float64-le",
+        "X-Equity-Points": str(ts_ms.size),
+        "X-Equity-Source-Points": str(points),
+        "X-Backtest-Kpi": json.dumps(kpi),
     }
+    return body, headers
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .audit import log_event
+from .metrics import CONDITIONAL_COUNTER
+from .ws_hub import ws_hub
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+CONDITIONAL_PATH = ROOT_DIR / "storage" / "conditional_orders.json"
+TRAIL_PERSIST_DELAY_SECONDS = 1.0
+
+KINDS = {"stop_loss", "take_profit", "trailing_stop"}
+SIDES = {"buy", "sell"}
+
+
+@dataclass
+class Trigger:
+    id: str
+    symbol: str
+    kind: str
+    side: str
+    size: str
+    trigger_px: float
+    direction: str
+    group: Optional[str] = None
+    trail_pct: Optional[float] = None
+    extreme_px: Optional[float] = None
+    status: str = "pending"
+    created_at: float = field(default_factory=time.time)
+    fired_at: Optional[float] = None
+    fired_px: Optional[float] = None
+    error: Optional[str] = None
+
+    def order_payload(self) -> Dict[str, Any]:
+        return {"instId": self.symbol, "tdMode": "cash", "side": self.side, "ordType": "market", "sz": self.size}
+
+
+def _direction(kind: str, side: str) -> str:
+    # "above" fires when price >= trigger_px, "below" when price <= trigger_px
+    if kind == "take_profit":
+        return "above" if side == "sell" else "below"
+    return "below" if side == "sell" else "above"
+
+
+class SymbolBook:
+    def __init__(self) -> None:
+        self.above: List[Tuple[float, str]] = []
+        self.below: List[Tuple[float, str]] = []
+        self.peaks: List[Tuple[float, str]] = []
+        self.troughs: List[Tuple[float, str]] = []
+
+    def insert(self, trigger: Trigger) -> None:
+        index = self.above if trigger.direction == "above" else self.below
+        insort(index, (trigger.trigger_px, trigger.id))
+        if trigger.kind == "trailing_stop":
+            if trigger.side == "sell":
+                heapq.heappush(self.peaks, (trigger.extreme_px, trigger.id))
+            else:
+                heapq.heappush(self.troughs, (-trigger.extreme_px, trigger.id))
+
+    def remove(self, trigger: Trigger) -> None:
+        index = self.above if trigger.direction == "above" else self.below
+        key = (trigger.trigger_px, trigger.id)
+        pos = bisect_left(index, key)
+        if pos < len(index) and index[pos] == key:
+            del index[pos]
+
+    def crossed(self, price: float) -> List[str]:
+        hit = bisect_right(self.above, (price, "\uffff"))
+        fired = [trigger_id for _, trigger_id in self.above[:hit]]
+        del self.above[:hit]
+        low = bisect_left(self.below, (price, ""))
+        fired.extend(trigger_id for _, trigger_id in self.below[low:])
+        del self.below[low:]
+        return fired
+
+    def __len__(self) -> int:
+        return len(self.above) + len(self.below)
+
+
+class ConditionalOrderEngine:
+    def __init__(self, path: Path = CONDITIONAL_PATH) -> None:
+        self.path = path
+        self.triggers: Dict[str, Trigger] = {}
+        self.books: Dict[str, SymbolBook] = {}
+        self.groups: Dict[str, Set[str]] = {}
+        self.last_px: Dict[str, float] = {}
+        self.history: List[Dict[str, Any]] = []
+        self.lock = asyncio.Lock()
+        self.loaded = False
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def initialize(self) -> None:
+        if self.loaded:
+            return
+        self.loaded = True
+        data = await asyncio.to_thread(self._read)
+        for item in data:
+            trigger = Trigger(**item)
+            if trigger.status == "pending":
+                self._index(trigger)
+        if self.triggers:
+            logger.info("Recovered %d pending conditional orders", len(self.triggers))
+
+    def _read(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable conditional order file at %s", self.path)
+            return []
+
+    def _write(self, data: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    async def _persist(self) -> None:
+        self._dirty = False
+        data = [asdict(trigger) for trigger in self.triggers.values()]
+        await asyncio.to_thread(self._write, data)
+
+    def _persist_later(self) -> None:
+        # trailing ratchets move on most ticks in a trend; coalesce them into one delayed write
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after(TRAIL_PERSIST_DELAY_SECONDS))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        async with self.lock:
+            if self._dirty:
+                await self._persist()
+
+    async def flush(self) -> None:
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        async with self.lock:
+            if self._dirty:
+                await self._persist()
+
+    def _index(self, trigger: Trigger) -> None:
+        self.triggers[trigger.id] = trigger
+        if trigger.group:
+            self.groups.setdefault(trigger.group, set()).add(trigger.id)
+        self.books.setdefault(trigger.symbol, SymbolBook()).insert(trigger)
+
+    def _detach(self, trigger: Trigger, status: str) -> None:
+        trigger.status = status
+        self.triggers.pop(trigger.id, None)
+        members = self.groups.get(trigger.group) if trigger.group else None
+        if members is not None:
+            members.discard(trigger.id)
+            if not members:
+                del self.groups[trigger.group]
+
+    def _unindex(self, trigger: Trigger, status: str) -> None:
+        self._detach(trigger, status)
+        book = self.books.get(trigger.symbol)
+        if book is not None:
+            book.remove(trigger)
+
+    def _build(self, payload: Dict[str, Any], group: Optional[str] = None) -> Trigger:
+        symbol = payload.get("instId")
+        kind = payload.get("kind", "")
+        side = payload.get("side", "sell")
+        size = str(payload.get("sz", ""))
+        if not symbol or not size:
+            raise ValueError("instId and sz are required")
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {sorted(KINDS)}")
+        if side not in SIDES:
+            raise ValueError("side must be buy or sell")
+        trail_pct = None
+        extreme_px = None
+        if kind == "trailing_stop":
+            trail_pct = float(payload.get("trailPct", 0))
+            if not 0 < trail_pct < 1:
+                raise ValueError("trailPct must be between 0 and 1")
+            extreme_px = float(payload.get("refPx") or self.last_px.get(symbol, 0))
+            if extreme_px <= 0:
+                raise ValueError("refPx is required until a price tick has been seen")
+            factor = 1 - trail_pct if side == "sell" else 1 + trail_pct
+            trigger_px = extreme_px * factor
+        else:
+            trigger_px = float(payload.get("triggerPx", 0))
+            if trigger_px <= 0:
+                raise ValueError("triggerPx must be positive")
+        return Trigger(
+            id=uuid.uuid4().hex,
+            symbol=symbol,
+            kind=kind,
+            side=side,
+            size=size,
+            trigger_px=trigger_px,
+            direction=_direction(kind, side),
+            group=group,
+            trail_pct=trail_pct,
+            extreme_px=extreme_px,
+        )
+
+    async def add(self, payload: Dict[str, Any]) -> Trigger:
+        trigger = self._build(payload)
+        async with self.lock:
+            self._index(trigger)
+            await self._persist()
+        CONDITIONAL_COUNTER.labels(trigger.kind, "created").inc()
+        log_event("conditional_created", asdict(trigger))
+        return trigger
+
+    async def add_oco(self, payload: Dict[str, Any]) -> List[Trigger]:
+        group = uuid.uuid4().hex
+        base = {key: payload[key] for key in ("instId", "side", "sz") if key in payload}
+        legs = [
+            self._build({**base, "kind": "take_profit", "triggerPx": payload.get("takeProfit")}, group),
+            self._build({**base, "kind": "stop_loss", "triggerPx": payload.get("stopLoss")}, group),
+        ]
+        async with self.lock:
+            for leg in legs:
+                self._index(leg)
+            await self._persist()
+        for leg in legs:
+            CONDITIONAL_COUNTER.labels(leg.kind, "created").inc()
+        log_event("conditional_oco_created", {"group": group, "legs": [asdict(leg) for leg in legs]})
+        return legs
+
+    async def cancel(self, trigger_id: str) -> List[Trigger]:
+        async with self.lock:
+            trigger = self.triggers.get(trigger_id)
+            if trigger is None:
+                return []
+            cancelled = [trigger] + self._siblings(trigger)
+            for item in cancelled:
+                self._unindex(item, "cancelled")
+            await self._persist()
+        for item in cancelled:
+            CONDITIONAL_COUNTER.labels(item.kind, "cancelled").inc()
+        log_event("conditional_cancelled", {"ids": [item.id for item in cancelled]})
+        return cancelled
+
+    def _siblings(self, trigger: Trigger) -> List[Trigger]:
+        if not trigger.group:
+            return []
+        return [
+            self.triggers[other_id]
+            for other_id in self.groups.get(trigger.group, ())
+            if other_id != trigger.id and other_id in self.triggers
+        ]
+
+    def _trail(self, book: SymbolBook, price: float) -> bool:
+        moved = False
+        while book.peaks and book.peaks[0][0] < price:
+            _, trigger_id = heapq.heappop(book.peaks)
+            trigger = self.triggers.get(trigger_id)
+            if trigger is None:
+                continue
+            book.remove(trigger)
+            trigger.extreme_px = price
+            trigger.trigger_px = price * (1 - trigger.trail_pct)
+            book.insert(trigger)
+            moved = True
+        while book.troughs and -book.troughs[0][0] > price:
+            _, trigger_id = heapq.heappop(book.troughs)
+            trigger = self.triggers.get(trigger_id)
+            if trigger is None:
+                continue
+            book.remove(trigger)
+            trigger.extreme_px = price
+            trigger.trigger_px = price * (1 + trigger.trail_pct)
+            book.insert(trigger)
+            moved = True
+        return moved
+
+    async def on_tick(self, symbol: str, price: float) -> List[Dict[str, Any]]:
+        self.last_px[symbol] = price
+        book = self.books.get(symbol)
+        if not book:
+            return []
+        async with self.lock:
+            moved = self._trail(book, price)
+            fired: List[Tuple[Trigger, List[Trigger]]] = []
+            for trigger_id in book.crossed(price):
+                trigger = self.triggers.get(trigger_id)
+                if trigger is None:
+                    continue
+                self._detach(trigger, "fired")
+                trigger.fired_at = time.time()
+                trigger.fired_px = price
+                siblings = self._siblings(trigger)
+                for sibling in siblings:
+                    self._unindex(sibling, "cancelled")
+                fired.append((trigger, siblings))
+            if not fired:
+                if moved:
+                    self._persist_later()
+                return []
+            await self._persist()
+        from ..broker.base import order_error  # local import
+        from ..broker.registry import broker_registry
+
+        broker = broker_registry.active()
+
+        results = []
+        failed: List[Tuple[Trigger, List[Trigger]]] = []
+        cancelled: List[Trigger] = []
+        for trigger, siblings in fired:
+            try:
+                response = await broker.place_order(trigger.order_payload())
+                error = order_error(response)
+            except Exception as exc:  # noqa: BLE001
+                error = str(exc) or type(exc).__name__
+            if error:
+                logger.warning("Conditional order %s failed to place: %s", trigger.id, error)
+                CONDITIONAL_COUNTER.labels(trigger.kind, "failed").inc()
+                trigger.error = error
+                failed.append((trigger, siblings))
+                results.append({"trigger": asdict(trigger), "error": error})
+                continue
+            CONDITIONAL_COUNTER.labels(trigger.kind, "fired").inc()
+            trigger.error = None
+            result = {"trigger": asdict(trigger), "broker_response": response}
+            results.append(result)
+            self.history.append(result)
+            cancelled.extend(siblings)
+        if failed:
+            async with self.lock:
+                for trigger, siblings in failed:
+                    for item in (trigger, *siblings):
+                        item.status = "pending"
+                        item.fired_at = None
+                        item.fired_px = None
+                        self._index(item)
+                await self._persist()
+        for sibling in cancelled:
+            CONDITIONAL_COUNTER.labels(sibling.kind, "cancelled").inc()
+        del self.history[:-100]
+        payload = {"fired": results, "cancelled": [item.id for item in cancelled]}
+        log_event("conditional_fired", payload)
+        await ws_hub.broadcast("orders", {"type": "conditional", "payload": payload})
+        return results
+
+    def pending(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            asdict(trigger)
+            for trigger in self.triggers.values()
+            if symbol is None or trigger.symbol == symbol
+        ]
+
+
+conditional_engine = ConditionalOrderEngine()
@@ -1,52 +1,284 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Dict
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
 
-from .env import env_manager
+from .env import EnvConfig, env_manager
 from .metrics import AI_GUARD_COUNTER, record_cost_remaining
 
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+LEDGER_PATH = ROOT_DIR / "storage" / "cost_ledger.json"
+HOUR_SECONDS = 3600.0
+RESERVATION_TTL_SECONDS = 300.0
+PERSIST_DELAY_SECONDS = 1.0
+
+
+@dataclass
+class Reservation:
+    id: str
+    cost: float
+    model: str
+    strategy: str
+    created_at: float
+
+
+def _next_midnight(now: float) -> float:
+    day = datetime.fromtimestamp(now, timezone.utc).date()
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return midnight.timestamp()
+
 
 class CostManager:
-    def __init__(self) -> None:
+    def __init__(self, path: Path = LEDGER_PATH) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.limit = 0.0
         self.spent = 0.0
-        self.last_reset = datetime.now(timezone.utc).date()
+        self.by_model: Dict[str, float] = {}
+        self.by_strategy: Dict[str, float] = {}
+        self.hourly: Deque[Tuple[float, float]] = deque()
+        self.hourly_spent = 0.0
+        self.reservations: Dict[str, Reservation] = {}
+        self.reserved = 0.0
+        self.reserved_by_model: Dict[str, float] = {}
+        self.reserved_by_strategy: Dict[str, float] = {}
+        self._version = 0
+        self._dirty: Optional[Dict[str, Any]] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        now = time.time()
+        self.last_reset = datetime.fromtimestamp(now, timezone.utc).date()
+        self._day_ends_at = _next_midnight(now)
+        self._load()
+        self.update_limit()
+        env_manager.subscribe(self._on_config)
+
+    def _on_config(self, config: EnvConfig) -> None:
         self.update_limit()
 
+    @property
+    def version(self) -> int:
+        with self.lock:
+            self._refresh()
+            return self._version
+
     def update_limit(self) -> None:
-        limit = env_manager.get("AI_DAILY_COST_LIMIT_USD", "0") or "0"
-        try:
-            self.limit = float(limit)
-        except ValueError:
-            self.limit = 0.0
+        self.limit = env_manager.config.ai_daily_cost_limit_usd
+        self._version += 1
         record_cost_remaining(max(self.limit - self.spent, 0.0))
 
-    def _ensure_reset(self) -> None:
-        today = datetime.now(timezone.utc).date()
-        if today != self.last_reset:
-            self.spent = 0.0
-            self.last_reset = today
-            record_cost_remaining(self.limit)
+    def _ensure_reset(self, now: float) -> None:
+        if now < self._day_ends_at:
+            return
+        self.spent = 0.0
+        self.by_model.clear()
+        self.by_strategy.clear()
+        self.last_reset = datetime.fromtimestamp(now, timezone.utc).date()
+        self._day_ends_at = _next_midnight(now)
+        self._version += 1
+        record_cost_remaining(self.limit)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - HOUR_SECONDS
+        while self.hourly and self.hourly[0][0] <= cutoff:
+            self.hourly_spent -= self.hourly.popleft()[1]
+            self._version += 1
+        if not self.hourly:
+            self.hourly_spent = 0.0
+        stale = [r for r in self.reservations.values() if now - r.created_at > RESERVATION_TTL_SECONDS]
+        for reservation in stale:
+            logger.warning("Releasing stale AI cost reservation %s", reservation.id)
+            self._unreserve(reservation)
+
+    def _refresh(self) -> float:
+        now = time.time()
+        self._ensure_reset(now)
+        self._prune(now)
+        return now
+
+    def _fits(self, cost: float, model: str, strategy: str) -> bool:
+        config = env_manager.config
+        if self.limit and self.spent + self.reserved + cost > self.limit:
+            return False
+        hourly_limit = config.ai_hourly_cost_limit_usd
+        if hourly_limit and self.hourly_spent + self.reserved + cost > hourly_limit:
+            return False
+        model_limit = config.ai_model_cost_limits.get(model)
+        if model_limit is not None:
+            used = self.by_model.get(model, 0.0) + self.reserved_by_model.get(model, 0.0)
+            if used + cost > model_limit:
+                return False
+        strategy_limit = config.ai_strategy_cost_limits.get(strategy)
+        if strategy_limit is not None:
+            used = self.by_strategy.get(strategy, 0.0) + self.reserved_by_strategy.get(strategy, 0.0)
+            if used + cost > strategy_limit:
+                return False
+        return True
+
+    def can_spend(self, cost: float, model: str = "", strategy: str = "") -> bool:
+        with self.lock:
+            self._refresh()
+            return self._fits(cost, model, strategy.lower())
 
-    def can_spend(self, cost: float) -> bool:
-        self._ensure_reset()
-        return (self.spent + cost) <= self.limit if self.limit else True
+    def reserve(self, cost: float, model: str = "", strategy: str = "") -> Optional[Reservation]:
+        strategy = strategy.lower()
+        with self.lock:
+            now = self._refresh()
+            if not self._fits(cost, model, strategy):
+                AI_GUARD_COUNTER.labels("block").inc()
+                return None
+            reservation = Reservation(uuid.uuid4().hex, cost, model, strategy, now)
+            self.reservations[reservation.id] = reservation
+            self.reserved += cost
+            self.reserved_by_model[model] = self.reserved_by_model.get(model, 0.0) + cost
+            self.reserved_by_strategy[strategy] = self.reserved_by_strategy.get(strategy, 0.0) + cost
+            self._version += 1
+        AI_GUARD_COUNTER.labels("allow").inc()
+        return reservation
 
-    def record(self, cost: float) -> None:
-        self._ensure_reset()
+    def _unreserve(self, reservation: Reservation) -> bool:
+        if self.reservations.pop(reservation.id, None) is None:
+            return False
+        self.reserved = max(self.reserved - reservation.cost, 0.0)
+        self.reserved_by_model[reservation.model] -= reservation.cost
+        self.reserved_by_strategy[reservation.strategy] -= reservation.cost
+        self._version += 1
+        return True
+
+    def release(self, reservation: Reservation) -> None:
+        with self.lock:
+            self._unreserve(reservation)
+
+    def commit(self, reservation: Reservation, actual_cost: Optional[float] = None) -> None:
+        with self.lock:
+            now = self._refresh()
+            self._unreserve(reservation)
+            cost = reservation.cost if actual_cost is None else actual_cost
+            self._charge(now, cost, reservation.model, reservation.strategy)
+        self._persist_later()
+
+    def record(self, cost: float, model: str = "", strategy: str = "") -> None:
+        with self.lock:
+            now = self._refresh()
+            self._charge(now, cost, model, strategy.lower())
+        self._persist_later()
+
+    def _charge(self, now: float, cost: float, model: str, strategy: str) -> None:
         self.spent += cost
+        self.hourly.append((now, cost))
+        self.hourly_spent += cost
+        self.by_model[model] = self.by_model.get(model, 0.0) + cost
+        self.by_strategy[strategy] = self.by_strategy.get(strategy, 0.0) + cost
+        self._version += 1
         record_cost_remaining(max(self.limit - self.spent, 0.0))
 
-    def budget(self) -> Dict[str, float]:
-        self._ensure_reset()
-        return {"limit": self.limit, "spent": self.spent, "remaining": max(self.limit - self.spent, 0.0)}
+    def remaining(self) -> float:
+        with self.lock:
+            self._refresh()
+            return max(self.limit - self.spent - self.reserved, 0.0)
 
-    def guard(self, cost: float) -> bool:
-        if self.can_spend(cost):
-            AI_GUARD_COUNTER.labels(action="allow").inc()
+    def budget(self) -> Dict[str, Any]:
+        with self.lock:
+            self._refresh()
+            return {
+                "limit": self.limit,
+                "spent": self.spent,
+                "remaining": max(self.limit - self.spent, 0.0),
+                "reserved": self.reserved,
+                "hourly": {
+                    "limit": env_manager.config.ai_hourly_cost_limit_usd,
+                    "spent": self.hourly_spent,
+                },
+                "by_model": dict(self.by_model),
+                "by_strategy": dict(self.by_strategy),
+            }
+
+    def guard(self, cost: float, model: str = "", strategy: str = "") -> bool:
+        if self.can_spend(cost, model, strategy):
+            AI_GUARD_COUNTER.labels("allow").inc()
             return True
-        AI_GUARD_COUNTER.labels(action="block").inc()
+        AI_GUARD_COUNTER.labels("block").inc()
         return False
 
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            "date": self.last_reset.isoformat(),
+            "spent": self.spent,
+            "by_model": dict(self.by_model),
+            "by_strategy": dict(self.by_strategy),
+            "hourly": list(self.hourly),
+        }
+
+    def _persist_later(self) -> None:
+        # coalesce ledger writes off the event loop; callers without a loop write inline
+        with self.lock:
+            self._dirty = self._snapshot()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_dirty()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_after(PERSIST_DELAY_SECONDS))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await asyncio.to_thread(self._write_dirty)
+
+    async def flush(self) -> None:
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self._write_dirty)
+
+    def _write_dirty(self) -> None:
+        with self._write_lock:
+            with self.lock:
+                snapshot, self._dirty = self._dirty, None
+            if snapshot is not None:
+                self._persist(snapshot)
+
+    def _persist(self, snapshot: Dict[str, Any]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError:  # pragma: no cover - safeguard
+            logger.exception("Failed to persist AI cost ledger")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable AI cost ledger at %s", self.path)
+            return
+        cutoff = time.time() - HOUR_SECONDS
+        self.hourly = deque((float(ts), float(cost)) for ts, cost in data.get("hourly", []) if ts > cutoff)
+        self.hourly_spent = sum(cost for _, cost in self.hourly)
+        if data.get("date") != self.last_reset.isoformat():
+            return
+        self.spent = float(data.get("spent", 0.0))
+        self.by_model = {k: float(v) for k, v in data.get("by_model", {}).items()}
+        self.by_strategy = {k: float(v) for k, v in data.get("by_strategy", {}).items()}
+
 
 cost_manager = CostManager()
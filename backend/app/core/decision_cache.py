@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .env import env_manager
+from .metrics import DECISION_CACHE_COUNTER, DECISION_CACHE_HIT_RATIO, DECISION_CACHE_SAVED_USD
+
+PRICE_STEP = 0.0025
+VOLATILITY_BUCKETS = (0.005, 0.01, 0.02, 0.04, 0.08)
+FEATURE_WINDOW_SECONDS = 300.0
+FEATURE_MAX_SAMPLES = 512
+
+CacheKey = Tuple[str, str, str]
+Vector = Tuple[int, ...]
+
+
+@dataclass
+class CachedDecision:
+    model: str
+    cost: float
+    expires_at: float
+    hits: int = 0
+
+
+class MarketFeatures:
+    def __init__(self, window: float = FEATURE_WINDOW_SECONDS, max_samples: int = FEATURE_MAX_SAMPLES) -> None:
+        self.window = window
+        self.max_samples = max_samples
+        self.samples: Dict[str, Deque[Tuple[float, float]]] = {}
+
+    def observe(self, symbol: str, price: float, ts: Optional[float] = None) -> None:
+        if price <= 0:
+            return
+        ts = ts or time.time()
+        samples = self.samples.get(symbol)
+        if samples is None or (samples and ts < samples[-1][0]):
+            # replays rewind the clock; start a fresh window rather than mix timelines
+            samples = self.samples[symbol] = deque(maxlen=self.max_samples)
+        samples.append((ts, price))
+        cutoff = ts - self.window
+        while samples[0][0] < cutoff:
+            samples.popleft()
+
+    def change(self, symbol: str) -> float:
+        samples = self.samples.get(symbol)
+        if not samples or len(samples) < 2:
+            return 0.0
+        return samples[-1][1] / samples[0][1] - 1
+
+    def volatility(self, symbol: str) -> float:
+        # realized volatility over the window: sqrt of summed squared log returns
+        samples = self.samples.get(symbol)
+        if not samples or len(samples) < 2:
+            return 0.0
+        prices = [price for _, price in samples]
+        return math.sqrt(sum(math.log(b / a) ** 2 for a, b in zip(prices, prices[1:])))
+
+    def snapshot(self, symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        return {
+            "price_changes": {symbol: self.change(symbol) for symbol in symbols},
+            "volatility": {symbol: self.volatility(symbol) for symbol in symbols},
+        }
+
+
+class DecisionCache:
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self.market = MarketFeatures()
+        self.entries: "OrderedDict[Tuple[CacheKey, Vector], CachedDecision]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_usd = 0.0
+
+    @property
+    def tolerance(self) -> int:
+        return env_manager.config.ai_decision_cache_tolerance
+
+    def ttl_for(self, strategy: str) -> float:
+        config = env_manager.config
+        ttl = config.ai_decision_cache_strategy_ttls.get(strategy.lower())
+        if ttl is not None:
+            return ttl
+        return config.ai_decision_cache_ttl_seconds
+
+    def features(self, strategy: str, context: Dict[str, Any]) -> Tuple[CacheKey, Vector]:
+        universe = sorted(context.get("universe", []))
+        changes = context.get("price_changes") or {symbol: self.market.change(symbol) for symbol in universe}
+        volatility = context.get("volatility") or {symbol: self.market.volatility(symbol) for symbol in universe}
+        vector = []
+        for symbol in universe:
+            vector.append(int(round(float(changes.get(symbol, 0.0)) / PRICE_STEP)))
+            vector.append(bisect_right(VOLATILITY_BUCKETS, float(volatility.get(symbol, 0.0))))
+        sentiment = context.get("sentiment")
+        if isinstance(sentiment, dict):
+            sentiment = sentiment.get("label")
+        key = (strategy.lower(), ",".join(universe), str(sentiment or "neutral"))
+        return key, tuple(vector)
+
+    def lookup(self, strategy: str, context: Dict[str, Any]) -> Optional[CachedDecision]:
+        if self.ttl_for(strategy) <= 0:
+            return None
+        key, vector = self.features(strategy, context)
+        now = time.monotonic()
+        entry_key = (key, vector)
+        entry = self.entries.get(entry_key)
+        if entry is None and self.tolerance:
+            entry_key, entry = self._nearest(key, vector)
+        if entry is not None and entry.expires_at <= now:
+            self.entries.pop(entry_key, None)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            DECISION_CACHE_COUNTER.labels("miss").inc()
+            self._record_ratio()
+            return None
+        self.entries.move_to_end(entry_key)
+        entry.hits += 1
+        self.hits += 1
+        self.saved_usd += entry.cost
+        DECISION_CACHE_COUNTER.labels("hit").inc()
+        DECISION_CACHE_SAVED_USD.inc(entry.cost)
+        self._record_ratio()
+        return entry
+
+    def _nearest(self, key: CacheKey, vector: Vector) -> Tuple[Any, Optional[CachedDecision]]:
+        tolerance = self.tolerance
+        best_key = None
+        best: Optional[CachedDecision] = None
+        best_distance = tolerance + 1
+        for entry_key, entry in self.entries.items():
+            candidate_key, candidate = entry_key
+            if candidate_key != key or len(candidate) != len(vector):
+                continue
+            distance = max((abs(a - b) for a, b in zip(candidate, vector)), default=0)
+            if distance < best_distance:
+                best_key, best, best_distance = entry_key, entry, distance
+        return best_key, best
+
+    def store(self, strategy: str, context: Dict[str, Any], model: str, cost: float) -> None:
+        ttl = self.ttl_for(strategy)
+        if ttl <= 0:
+            return
+        key, vector = self.features(strategy, context)
+        entry_key = (key, vector)
+        self.entries[entry_key] = CachedDecision(model=model, cost=cost, expires_at=time.monotonic() + ttl)
+        self.entries.move_to_end(entry_key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def _record_ratio(self) -> None:
+        total = self.hits + self.misses
+        DECISION_CACHE_HIT_RATIO.set(self.hits / total if total else 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_usd": round(self.saved_usd, 6),
+            "tolerance": self.tolerance,
+            "ttls": {
+                "default": env_manager.config.ai_decision_cache_ttl_seconds,
+                **env_manager.config.ai_decision_cache_strategy_ttls,
+            },
+            "market": self.market.snapshot(sorted(self.market.samples)),
+        }
+
+
+decision_cache = DecisionCache()
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 
 from dotenv import dotenv_values
 
+logger = logging.getLogger(__name__)
+
 ROOT_DIR = Path(__file__).resolve().parents[2]
 ENV_PATH = ROOT_DIR / ".env"
+WATCH_INTERVAL_SECONDS = 1.0
 
 DEFAULT_ENV: Dict[str, str] = {
     "MODE": "PAPER",
     "EXCHANGE_ACTIVE": "OKX",
+    "ROUTER_VENUES": "OKX",
     "OPENAI_MODEL_TIER": "GPT-5-MINI",
     "OPENAI_API_KEY": "",
     "CORS_ALLOW_ORIGINS": "http://localhost:5173,http://127.0.0.1:5173",
@@ -21,54 +29,234 @@ DEFAULT_ENV: Dict[str, str] = {
     "OKX_API_KEY_REAL": "",
     "OKX_API_SECRET_REAL": "",
     "OKX_API_PASSPHRASE_REAL": "",
+    "OKX_BASE_URL": "https://www.okx.com",
     "SENTRY_DSN": "",
     "AI_DAILY_COST_LIMIT_USD": "50",
+    "AI_HOURLY_COST_LIMIT_USD": "0",
+    "AI_MODEL_COST_LIMITS": "",
+    "AI_STRATEGY_COST_LIMITS": "",
+    "AI_DECISION_CACHE_TTL_SECONDS": "60",
+    "AI_DECISION_CACHE_STRATEGY_TTLS": "dca=300,grid=120,breakout=30",
+    "AI_DECISION_CACHE_TOLERANCE": "1",
+    "LOOP_SLOW_CALLBACK_MS": "100",
     "DAILY_INVEST_LIMIT_USDT": "5000",
     "SINGLE_TRADE_LIMIT_USDT": "1000",
     "TOTAL_CAPITAL_USDT": "20000",
 }
 
 
+def _as_float(value: Optional[str], default: float = 0.0) -> float:
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+def _as_int(value: Optional[str], default: int = 0) -> int:
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def _as_limits(value: Optional[str]) -> Mapping[str, float]:
+    limits: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        name, _, amount = item.partition("=")
+        if name.strip() and amount.strip():
+            limits[name.strip()] = _as_float(amount.strip())
+    return MappingProxyType(limits)
+
+
+@dataclass(frozen=True)
+class EnvConfig:
+    values: Mapping[str, str]
+    mode: str
+    exchange_active: str
+    router_venues: Tuple[str, ...]
+    model_tier: str
+    ai_daily_cost_limit_usd: float
+    ai_hourly_cost_limit_usd: float
+    ai_model_cost_limits: Mapping[str, float]
+    ai_strategy_cost_limits: Mapping[str, float]
+    ai_decision_cache_ttl_seconds: float
+    ai_decision_cache_strategy_ttls: Mapping[str, float]
+    ai_decision_cache_tolerance: int
+    loop_slow_callback_ms: float
+    daily_invest_limit_usdt: float
+    single_trade_limit_usdt: float
+    total_capital_usdt: float
+
+    @classmethod
+    def from_values(cls, values: Dict[str, str]) -> "EnvConfig":
+        return cls(
+            values=MappingProxyType(dict(values)),
+            mode=(values.get("MODE") or "PAPER").upper(),
+            exchange_active=(values.get("EXCHANGE_ACTIVE") or "OKX").upper(),
+            router_venues=tuple(
+                name.strip().upper() for name in (values.get("ROUTER_VENUES") or "OKX").split(",") if name.strip()
+            ),
+            model_tier=values.get("OPENAI_MODEL_TIER") or "GPT-5-MINI",
+            ai_daily_cost_limit_usd=_as_float(values.get("AI_DAILY_COST_LIMIT_USD")),
+            ai_hourly_cost_limit_usd=_as_float(values.get("AI_HOURLY_COST_LIMIT_USD")),
+            ai_model_cost_limits=_as_limits(values.get("AI_MODEL_COST_LIMITS")),
+            ai_strategy_cost_limits=_as_limits(values.get("AI_STRATEGY_COST_LIMITS")),
+            ai_decision_cache_ttl_seconds=_as_float(values.get("AI_DECISION_CACHE_TTL_SECONDS")),
+            ai_decision_cache_strategy_ttls=_as_limits(values.get("AI_DECISION_CACHE_STRATEGY_TTLS")),
+            ai_decision_cache_tolerance=max(_as_int(values.get("AI_DECISION_CACHE_TOLERANCE")), 0),
+            loop_slow_callback_ms=_as_float(values.get("LOOP_SLOW_CALLBACK_MS"), 100.0),
+            daily_invest_limit_usdt=_as_float(values.get("DAILY_INVEST_LIMIT_USDT")),
+            single_trade_limit_usdt=_as_float(values.get("SINGLE_TRADE_LIMIT_USDT")),
+            total_capital_usdt=_as_float(values.get("TOTAL_CAPITAL_USDT")),
+        )
+
+
+Subscriber = Callable[[EnvConfig], None]
+
+
 class EnvManager:
     def __init__(self, path: Path) -> None:
         self.path = path
         self._env: Dict[str, str] = {}
+        self._config = EnvConfig.from_values(DEFAULT_ENV)
+        self._subscribers: List[Subscriber] = []
+        self._mtime_ns: Optional[int] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.version = 0
         self.load()
 
+    @property
+    def config(self) -> EnvConfig:
+        return self._config
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _read_file(self) -> Dict[str, str]:
+        values = dotenv_values(self.path)
+        merged = DEFAULT_ENV.copy()
+        merged.update({k: v for k, v in values.items() if v is not None})
+        return merged
+
     def load(self) -> None:
         if not self.path.exists():
-            self._env = DEFAULT_ENV.copy()
-            self.write(DEFAULT_ENV)
+            self._apply(DEFAULT_ENV.copy())
         else:
-            values = dotenv_values(self.path)
-            merged = DEFAULT_ENV.copy()
-            merged.update({k: v for k, v in values.items() if v is not None})
-            self._env = merged
+            self._mtime_ns = self._stat_mtime()
+            self._apply(self._read_file())
+
+    def reload_if_changed(self) -> bool:
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._mtime_ns:
+            return False
+        return self._reload(mtime, self._read_file())
+
+    def _reload(self, mtime: int, values: Dict[str, str]) -> bool:
+        self._mtime_ns = mtime
+        if values == self._env:
+            return False
+        logger.info("Reloading %s after external change", self.path)
+        self._apply(values)
+        return True
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _apply(self, values: Dict[str, str]) -> None:
+        changed = {key: value for key, value in values.items() if self._env.get(key) != value}
+        self._env = values
+        self._config = EnvConfig.from_values(values)
+        self.version += 1
+        if changed:
+            os.environ.update(changed)
+        for callback in list(self._subscribers):
+            try:
+                callback(self._config)
+            except Exception:  # pragma: no cover - safeguard
+                logger.exception("Env subscriber %r failed", callback)
+
+    def _write_file(self, values: Dict[str, str]) -> Optional[int]:
+        lines = [f"{key}={values.get(key, '')}" for key in sorted(DEFAULT_ENV.keys())]
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        os.replace(tmp_path, self.path)
+        return self._stat_mtime()
 
     def get(self, key: str, default: Optional[str] = None) -> str:
         return self._env.get(key, default or "")
 
     @property
     def mode(self) -> str:
-        return self.get("MODE", "PAPER")
+        return self._config.mode
 
     def write(self, updates: Dict[str, str]) -> Dict[str, str]:
-        self._env.update(updates)
-        lines = [f"{key}={self._env.get(key, '')}" for key in sorted(DEFAULT_ENV.keys())]
-        with self.path.open("w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
-        os.environ.update(self._env)
+        values = {**self._env, **updates}
+        self._mtime_ns = self._write_file(values)
+        self._apply(values)
         return self._env
 
+    async def write_async(self, updates: Dict[str, str]) -> Dict[str, str]:
+        async with self._lock:
+            values = {**self._env, **updates}
+            self._mtime_ns = await asyncio.to_thread(self._write_file, values)
+            self._apply(values)
+            return self._env
+
+    def _clean(self, payload: Dict[str, str]) -> Dict[str, str]:
+        return {k: str(v) for k, v in payload.items() if k in DEFAULT_ENV}
+
     def update_env(self, payload: Dict[str, str]) -> Dict[str, str]:
-        clean_payload = {k: v for k, v in payload.items() if k in DEFAULT_ENV}
-        return self.write(clean_payload)
+        return self.write(self._clean(payload))
 
-    def switch_mode(self, mode: str) -> Dict[str, str]:
+    async def update_env_async(self, payload: Dict[str, str]) -> Dict[str, str]:
+        return await self.write_async(self._clean(payload))
+
+    @staticmethod
+    def _validate_mode(mode: str) -> str:
         mode = mode.upper()
         if mode not in {"PAPER", "REAL"}:
             raise ValueError("mode must be PAPER or REAL")
-        return self.write({"MODE": mode})
+        return mode
+
+    def switch_mode(self, mode: str) -> Dict[str, str]:
+        return self.write({"MODE": self._validate_mode(mode)})
+
+    async def switch_mode_async(self, mode: str) -> Dict[str, str]:
+        return await self.write_async({"MODE": self._validate_mode(mode)})
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with self._lock:
+                    mtime = self._stat_mtime()
+                    if mtime is not None and mtime != self._mtime_ns:
+                        self._reload(mtime, await asyncio.to_thread(self._read_file))
+            except Exception:  # pragma: no cover - safeguard
+                logger.exception("Env watcher failed")
+
+    def start_watching(self, interval: float = WATCH_INTERVAL_SECONDS) -> None:
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
 
     def masked_env(self) -> Dict[str, str]:
         masked: Dict[str, str] = {}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from . import audit
+from .history import ROOT_DIR, iter_candles, parse_time
+
+EXPORT_DIR = ROOT_DIR.parent / "exports"
+EXPORT_FORMATS = ("csv", "parquet")
+CHUNK_ROWS = 50_000
+TRADE_EVENTS = ("conditional_fired", "stream_signal", "autopilot_tick")
+
+Chunk = Dict[str, Any]
+
+
+def candle_chunks(symbol: str, bar: str = "1H", start: Any = 0, end: Any = None, **_: Any) -> Iterator[Chunk]:
+    end_ms = parse_time(end) if end else int(datetime.now(timezone.utc).timestamp() * 1000)
+    yield from iter_candles(symbol, bar, parse_time(start), end_ms)
+
+
+def equity_chunks(strategy: str = "dca", days: int = 365, bar_seconds: int = 86400, **_: Any) -> Iterator[Chunk]:
+    from .backtest import simulate_equity
+
+    ts_ms, equity, _kpi = simulate_equity(strategy, int(days), int(bar_seconds))
+    for offset in range(0, len(ts_ms), CHUNK_ROWS):
+        yield {"ts": ts_ms[offset:offset + CHUNK_ROWS], "equity": equity[offset:offset + CHUNK_ROWS]}
+
+
+def audit_chunks(start: Any = None, end: Any = None, events: Optional[tuple] = None, **_: Any) -> Iterator[Chunk]:
+    start_ms = parse_time(start) if start else None
+    end_ms = parse_time(end) if end else None
+    if not audit.AUDIT_PATH.exists():
+        return
+    rows: List[List[Any]] = []
+    with audit.AUDIT_PATH.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if events and entry.get("event") not in events:
+                continue
+            ts_ms = parse_time(entry.get("ts", ""))
+            if (start_ms is not None and ts_ms < start_ms) or (end_ms is not None and ts_ms > end_ms):
+                continue
+            rows.append([ts_ms, entry.get("event", ""), json.dumps(entry.get("payload", {}), ensure_ascii=False)])
+            if len(rows) >= CHUNK_ROWS:
+                yield _audit_chunk(rows)
+                rows = []
+    if rows:
+        yield _audit_chunk(rows)
+
+
+def _audit_chunk(rows: List[List[Any]]) -> Chunk:
+    return {"ts": [row[0] for row in rows], "event": [row[1] for row in rows], "payload": [row[2] for row in rows]}
+
+
+def trade_chunks(**params: Any) -> Iterator[Chunk]:
+    return audit_chunks(events=TRADE_EVENTS, **params)
+
+
+EXPORTERS: Dict[str, Callable[..., Iterator[Chunk]]] = {
+    "candles": candle_chunks,
+    "equity": equity_chunks,
+    "audit": audit_chunks,
+    "trades": trade_chunks,
+}
+
+
+def _column_list(values: Any) -> List[Any]:
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def write_csv(path: Path, chunks: Iterator[Chunk]) -> int:
+    rows = 0
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        header_written = False
+        for chunk in chunks:
+            if not header_written:
+                writer.writerow(list(chunk))
+                header_written = True
+            columns = [_column_list(values) for values in chunk.values()]
+            writer.writerows(zip(*columns))
+            rows += len(columns[0]) if columns else 0
+    return rows
+
+
+def write_parquet(path: Path, chunks: Iterator[Chunk]) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("parquet export requires pyarrow; install it or use format=csv") from exc
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.table({name: values for name, values in chunk.items()})
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS: Dict[str, Callable[[Path, Iterator[Chunk]], int]] = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export(kind: str, fmt: str = "csv", name: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+    if kind not in EXPORTERS:
+        raise ValueError(f"kind must be one of {', '.join(EXPORTERS)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    if kind == "candles" and not params.get("symbol"):
+        raise ValueError("candles export requires a symbol")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    stem = Path(name).name if name else f"{kind}-{params.get('symbol') or params.get('strategy') or 'all'}-{stamp}"
+    path = EXPORT_DIR / kind / f"{stem}.{fmt}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        rows = WRITERS[fmt](tmp_path, EXPORTERS[kind](**params))
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return {
+        "kind": kind,
+        "format": fmt,
+        "path": str(path.relative_to(EXPORT_DIR.parent)),
+        "rows": rows,
+        "bytes": path.stat().st_size,
+    }
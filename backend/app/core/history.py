@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+HISTORY_DIR = ROOT_DIR / "storage" / "history"
+CHECKPOINT_PATH = HISTORY_DIR / "checkpoints.json"
+HISTORY_CANDLES_PATH = "/api/v5/market/history-candles"
+TIMEFRAMES: Dict[str, int] = {"1m": 60, "5m": 300, "15m": 900, "1H": 3600, "4H": 14400, "1D": 86400}
+# OKX opens 1D candles at Hong Kong midnight (16:00 UTC); intraday bars sit on the UTC grid
+GRID_OFFSETS_MS: Dict[str, int] = {"1D": 16 * 3600 * 1000}
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+PAGE_LIMIT = 100
+FLUSH_ROWS = 5000
+MAX_RETRIES = 5
+# OKX allows 20 history-candles requests per 2 seconds per IP
+RATE_PER_SECOND = 10.0
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9]+(-[A-Z0-9]+)*$")
+
+
+class BackfillError(RuntimeError):
+    pass
+
+
+def parse_time(value: Any) -> int:
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        number = int(value)
+        return number if number > 1e12 else number * 1000
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ValueError(f"invalid time {value!r}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def _validate(symbol: str, bar: str) -> None:
+    if not SYMBOL_PATTERN.match(symbol):
+        raise ValueError(f"invalid symbol {symbol!r}")
+    if bar not in TIMEFRAMES:
+        raise ValueError(f"bar must be one of {', '.join(TIMEFRAMES)}")
+
+
+def _partition_dir(symbol: str, bar: str) -> Path:
+    _validate(symbol, bar)
+    return HISTORY_DIR / symbol / bar
+
+
+def _month_key(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000, timezone.utc).strftime("%Y-%m")
+
+
+def _read_partition(path: Path) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {column: data[column] for column in COLUMNS}
+
+
+def _write_partition(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as handle:
+        np.savez(handle, **columns)
+    os.replace(tmp_path, path)
+
+
+def _to_columns(rows: Sequence[Sequence[Any]]) -> Dict[str, np.ndarray]:
+    raw = np.asarray([row[:6] for row in rows], dtype=np.float64).reshape(-1, 6)
+    columns = {column: raw[:, index] for index, column in enumerate(COLUMNS)}
+    columns["ts"] = raw[:, 0].astype(np.int64)
+    return columns
+
+
+def store_candles(symbol: str, bar: str, rows: Sequence[Sequence[Any]]) -> int:
+    if not rows:
+        return 0
+    base = _partition_dir(symbol, bar)
+    incoming = _to_columns(rows)
+    months = incoming["ts"].astype("datetime64[ms]").astype("datetime64[M]")
+    for month in np.unique(months):
+        mask = months == month
+        path = base / f"{str(month)}.npz"
+        chunk = {column: values[mask] for column, values in incoming.items()}
+        if path.exists():
+            existing = _read_partition(path)
+            chunk = {column: np.concatenate([existing[column], chunk[column]]) for column in COLUMNS}
+        # newest row wins when a candle is fetched twice
+        order = np.argsort(chunk["ts"], kind="stable")[::-1]
+        _, first = np.unique(chunk["ts"][order], return_index=True)
+        keep = order[first]
+        _write_partition(path, {column: values[keep] for column, values in chunk.items()})
+    return len(incoming["ts"])
+
+
+def partitions(symbol: str, bar: str, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[Path]:
+    base = _partition_dir(symbol, bar)
+    if not base.exists():
+        return []
+    first = _month_key(start_ms) if start_ms is not None else ""
+    last = _month_key(end_ms) if end_ms is not None else "9999-99"
+    return [path for path in sorted(base.glob("*.npz")) if first <= path.stem <= last]
+
+
+def iter_candles(symbol: str, bar: str, start_ms: int, end_ms: int) -> Iterator[Dict[str, np.ndarray]]:
+    # one monthly partition in memory at a time
+    for path in partitions(symbol, bar, start_ms, end_ms):
+        columns = _read_partition(path)
+        mask = (columns["ts"] >= start_ms) & (columns["ts"] <= end_ms)
+        if mask.any():
+            yield {column: values[mask] for column, values in columns.items()}
+
+
+def load_candles(symbol: str, bar: str, start_ms: int, end_ms: int) -> Dict[str, np.ndarray]:
+    chunks = list(iter_candles(symbol, bar, start_ms, end_ms))
+    if not chunks:
+        return {column: np.empty(0, dtype=np.int64 if column == "ts" else np.float64) for column in COLUMNS}
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in COLUMNS}
+
+
+def _aligned(ts_ms: int, step_ms: int, up: bool, offset_ms: int = 0) -> int:
+    shifted = ts_ms - offset_ms
+    return (-(-shifted // step_ms) if up else shifted // step_ms) * step_ms + offset_ms
+
+
+def find_gaps(symbol: str, bar: str, start_ms: int, end_ms: int) -> Dict[str, Any]:
+    step = TIMEFRAMES[bar] * 1000
+    ts = np.concatenate([chunk["ts"] for chunk in iter_candles(symbol, bar, start_ms, end_ms)] or [np.empty(0, np.int64)])
+    offset = GRID_OFFSETS_MS.get(bar, 0)
+    first, last = _aligned(start_ms, step, True, offset), _aligned(end_ms, step, False, offset)
+    expected = max((last - first) // step + 1, 0)
+    if not len(ts):
+        gaps = [{"from": first, "to": last, "missing": expected}] if expected else []
+        return {"symbol": symbol, "bar": bar, "expected": expected, "stored": 0, "gaps": gaps}
+    edges = np.concatenate([[first - step], ts, [last + step]])
+    jumps = np.diff(edges)
+    gaps = [
+        {"from": int(edges[index] + step), "to": int(edges[index + 1] - step), "missing": int(jumps[index] // step - 1)}
+        for index in np.flatnonzero(jumps > step)
+    ]
+    return {"symbol": symbol, "bar": bar, "expected": expected, "stored": int(len(ts)), "gaps": gaps}
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def load_checkpoints() -> Dict[str, Dict[str, Any]]:
+    if not CHECKPOINT_PATH.exists():
+        return {}
+    try:
+        return json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable backfill checkpoints at %s", CHECKPOINT_PATH)
+        return {}
+
+
+_checkpoint_lock = threading.Lock()
+
+
+def _save_checkpoints(checkpoints: Dict[str, Dict[str, Any]]) -> None:
+    # parallel pairs save from worker threads and share one tmp path
+    with _checkpoint_lock:
+        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CHECKPOINT_PATH.with_name(f"{CHECKPOINT_PATH.name}.tmp")
+        tmp_path.write_text(json.dumps(checkpoints, indent=2), encoding="utf-8")
+        os.replace(tmp_path, CHECKPOINT_PATH)
+
+
+class Backfiller:
+    def __init__(self, rate: float = RATE_PER_SECOND) -> None:
+        self.limiter = RateLimiter(rate)
+        self.checkpoints = load_checkpoints()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    async def fetch_page(self, symbol: str, bar: str, after: int) -> List[List[str]]:
+        from ..broker.okx import okx_broker  # local import
+
+        params = {"instId": symbol, "bar": bar, "after": str(after), "limit": str(PAGE_LIMIT)}
+        delay = 0.5
+        for attempt in range(MAX_RETRIES):
+            await self.limiter.acquire()
+            try:
+                response = await okx_broker.client.get(HISTORY_CANDLES_PATH, params=params)
+                body = response.json() if response.status_code != 429 else {"code": "50011"}
+            except (httpx.HTTPError, ValueError) as exc:
+                logger.warning("history-candles %s %s failed (%s), retry %s", symbol, bar, exc, attempt + 1)
+            else:
+                if body.get("code") == "0":
+                    return body.get("data") or []
+                if body.get("code") != "50011":
+                    raise BackfillError(f"{symbol} {bar}: {body.get('msg') or body.get('code')}")
+            await asyncio.sleep(delay)
+            delay *= 2
+        raise BackfillError(f"{symbol} {bar}: gave up after {MAX_RETRIES} attempts")
+
+    async def backfill(self, symbol: str, bar: str, start_ms: int, end_ms: int, progress: Dict[str, Any]) -> Dict[str, Any]:
+        key = f"{symbol}|{bar}"
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint and checkpoint["start"] <= start_ms and checkpoint["end"] >= end_ms and checkpoint["done"]:
+            progress.update(status="skipped", cursor=checkpoint["cursor"])
+            return progress
+        resume = checkpoint and checkpoint["start"] == start_ms and checkpoint["end"] == end_ms
+        cursor = checkpoint["cursor"] if resume else end_ms + 1
+        progress.update(status="running", cursor=cursor, resumed=bool(resume))
+        buffer: List[List[str]] = []
+        done = False
+        while not done:
+            page = await self.fetch_page(symbol, bar, cursor)
+            progress["pages"] += 1
+            if not page:
+                done = True
+            else:
+                oldest = min(int(row[0]) for row in page)
+                buffer.extend(row for row in page if start_ms <= int(row[0]) <= end_ms)
+                done = oldest <= start_ms or oldest >= cursor
+                cursor = oldest
+            if done or len(buffer) >= FLUSH_ROWS:
+                # checkpoint only after the rows are on disk so a restart never skips data
+                progress["candles"] += await asyncio.to_thread(store_candles, symbol, bar, buffer)
+                buffer = []
+                self.checkpoints[key] = {"start": start_ms, "end": end_ms, "cursor": cursor, "done": done}
+                await asyncio.to_thread(_save_checkpoints, dict(self.checkpoints))
+                progress["cursor"] = cursor
+        progress["gaps"] = (await asyncio.to_thread(find_gaps, symbol, bar, start_ms, end_ms))["gaps"]
+        progress["status"] = "done"
+        return progress
+
+    async def run(
+        self,
+        symbols: Sequence[str],
+        bars: Sequence[str],
+        start: Any,
+        end: Any,
+        concurrency: int = 4,
+        job_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        job = self._job(symbols, bars, start, end, job_id)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def one(symbol: str, bar: str) -> None:
+            progress = job["progress"][f"{symbol}|{bar}"]
+            async with semaphore:
+                try:
+                    await self.backfill(symbol, bar, job["start"], job["end"], progress)
+                except BackfillError as exc:
+                    progress.update(status="failed", error=str(exc))
+                except OSError as exc:
+                    logger.exception("Backfill %s %s failed to write", symbol, bar)
+                    progress.update(status="failed", error=f"{symbol} {bar}: {exc}")
+
+        job["status"] = "running"
+        try:
+            await asyncio.gather(*(one(symbol, bar) for symbol in job["symbols"] for bar in job["bars"]))
+            failed = any(item["status"] == "failed" for item in job["progress"].values())
+            job["status"] = "failed" if failed else "done"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except Exception as exc:  # noqa: BLE001 - background jobs must not die silently
+            logger.exception("Backfill job %s failed", job["id"])
+            job.update(status="failed", error=str(exc) or type(exc).__name__)
+        finally:
+            job["finished_at"] = time.time()
+        return job
+
+    def _job(self, symbols: Sequence[str], bars: Sequence[str], start: Any, end: Any, job_id: Optional[str]) -> Dict[str, Any]:
+        if job_id and job_id in self.jobs:
+            return self.jobs[job_id]
+        start_ms, end_ms = parse_time(start), parse_time(end)
+        if start_ms >= end_ms:
+            raise ValueError("start must be before end")
+        if not symbols or not bars:
+            raise ValueError("symbols and bars are required")
+        for symbol in symbols:
+            for bar in bars:
+                _validate(symbol, bar)
+        job_id = job_id or uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "status": "pending",
+            "symbols": list(symbols),
+            "bars": list(bars),
+            "start": start_ms,
+            "end": end_ms,
+            "started_at": time.time(),
+            "finished_at": None,
+            "progress": {
+                f"{symbol}|{bar}": {"status": "pending", "pages": 0, "candles": 0, "cursor": None}
+                for symbol in symbols
+                for bar in bars
+            },
+        }
+        self.jobs[job_id] = job
+        return job
+
+    def start(self, symbols: Sequence[str], bars: Sequence[str], start: Any, end: Any, concurrency: int = 4) -> Dict[str, Any]:
+        job = self._job(symbols, bars, start, end, None)
+        self.tasks[job["id"]] = asyncio.get_running_loop().create_task(
+            self.run(symbols, bars, start, end, concurrency, job["id"])
+        )
+        return job
+
+
+backfiller = Backfiller()
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.history", description="OKX candle backfill and export")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backfill = sub.add_parser("backfill", help="download candles into storage/history")
+    backfill.add_argument("--symbols", required=True, help="comma separated, e.g. BTC-USDT,ETH-USDT")
+    backfill.add_argument("--bars", default="1H", help=f"comma separated from {','.join(TIMEFRAMES)}")
+    backfill.add_argument("--start", required=True, help="ISO date/time or epoch")
+    backfill.add_argument("--end", default=datetime.now(timezone.utc).isoformat())
+    backfill.add_argument("--concurrency", type=int, default=4)
+    gaps = sub.add_parser("gaps", help="report missing candles in stored history")
+    gaps.add_argument("--symbol", required=True)
+    gaps.add_argument("--bar", default="1H")
+    gaps.add_argument("--start", required=True)
+    gaps.add_argument("--end", default=datetime.now(timezone.utc).isoformat())
+    export = sub.add_parser("export", help="stream candles, equity or audit rows to exports/")
+    export.add_argument("kind", choices=("candles", "equity", "audit", "trades"))
+    export.add_argument("--format", default="csv", choices=("csv", "parquet"))
+    export.add_argument("--symbol")
+    export.add_argument("--bar", default="1H")
+    export.add_argument("--strategy", default="dca")
+    export.add_argument("--days", type=int, default=365)
+    export.add_argument("--bar-seconds", type=int, default=86400)
+    export.add_argument("--start")
+    export.add_argument("--end")
+    export.add_argument("--name", help="output file name without extension")
+    args = parser.parse_args(argv)
+
+    if args.command == "backfill":
+        async def run() -> Dict[str, Any]:
+            try:
+                return await backfiller.run(_split(args.symbols), _split(args.bars), args.start, args.end, args.concurrency)
+            finally:
+                from ..broker.okx import okx_broker  # local import
+
+                await okx_broker.close()
+
+        job = asyncio.run(run())
+        for key, progress in job["progress"].items():
+            gap_count = sum(gap["missing"] for gap in progress.get("gaps", []))
+            print(f"{key:<24} {progress['status']:<8} {progress['candles']:>9} candles {progress['pages']:>6} pages  {gap_count} missing")
+        return 0 if job["status"] == "done" else 1
+    if args.command == "gaps":
+        report = find_gaps(args.symbol, args.bar, parse_time(args.start), parse_time(args.end))
+        print(json.dumps(report, indent=2))
+        return 0
+    from .export import export as run_export
+
+    params = {key: value for key, value in vars(args).items() if key not in ("command", "kind", "format", "name") and value is not None}
+    print(json.dumps(run_export(args.kind, args.format, args.name, **params), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
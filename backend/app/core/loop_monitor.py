@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .env import env_manager
+from .metrics import LOOP_LAG, LOOP_SLOW_CALLBACK_COUNTER
+
+LAG_INTERVAL_SECONDS = 0.1
+MAX_PROFILE_SECONDS = 60.0
+MAX_STALLS = 50
+LAG_WINDOW = 600
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(APP_ROOT):
+        path = os.path.relpath(path, APP_ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: Any) -> str:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = LAG_INTERVAL_SECONDS) -> None:
+        self.interval = interval
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.lags: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self.max_lag = 0.0
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=MAX_STALLS)
+        self._heartbeat = time.monotonic()
+        self._open_stall: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._profile_lock = threading.Lock()
+
+    @property
+    def threshold(self) -> float:
+        return env_manager.config.loop_slow_callback_ms / 1000
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = self.loop.create_task(self._measure())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self._heartbeat = time.monotonic()
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+            stall = self._open_stall
+            if stall is not None:
+                stall["duration_ms"] = (self._heartbeat - stall["_started"]) * 1000
+                self._open_stall = None
+
+    def _watch(self) -> None:
+        # runs off-loop so it can see the loop thread while a callback is blocking it
+        while not self._stop.wait(max(min(self.threshold / 2, 0.05), 0.01)):
+            threshold = self.threshold
+            blocked = time.monotonic() - self._heartbeat - self.interval
+            if threshold <= 0 or blocked < threshold or self._open_stall is not None:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stall = {
+                "ts": time.time(),
+                "blocked_ms": blocked * 1000,
+                "duration_ms": None,
+                "stack": traceback.format_stack(frame),
+                "_started": self._heartbeat + self.interval,
+            }
+            self._open_stall = stall
+            self.stalls.append(stall)
+            LOOP_SLOW_CALLBACK_COUNTER.inc()
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.lags)
+
+        def pct(value: float) -> float:
+            return ordered[min(int(value * len(ordered)), len(ordered) - 1)] * 1000 if ordered else 0.0
+
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "slow_callback_threshold_ms": self.threshold * 1000,
+            "lag_ms": {
+                "last": self.lags[-1] * 1000 if self.lags else 0.0,
+                "p50": pct(0.5),
+                "p99": pct(0.99),
+                "max": self.max_lag * 1000,
+                "samples": len(ordered),
+            },
+            "stalls": [{k: v for k, v in stall.items() if not k.startswith("_")} for stall in reversed(self.stalls)],
+        }
+
+    def sample(self, seconds: float, interval: float = 0.005, all_threads: bool = False) -> Optional[str]:
+        if not self._profile_lock.acquire(blocking=False):
+            return None
+        try:
+            own = threading.get_ident()
+            target = None if all_threads else (self.loop_thread_id or threading.main_thread().ident)
+            stacks: Counter = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own or (target is not None and thread_id != target):
+                        continue
+                    stacks[collapse_stack(frame)] += 1
+                time.sleep(interval)
+            return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        finally:
+            self._profile_lock.release()
+
+    async def profile(self, seconds: float, interval: float = 0.005, all_threads: bool = False) -> Optional[str]:
+        return await asyncio.to_thread(self.sample, seconds, interval, all_threads)
+
+
+loop_monitor = LoopMonitor()
@@ -1,18 +1,119 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import os
+import threading
+from typing import Any, Dict, Tuple
 
 from fastapi import Response
-from prometheus_client import Counter, Gauge, Histogram
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
 
-REQUEST_COUNTER = Counter("app_requests_total", "Number of HTTP requests", ["route"])
-AI_MODEL_COUNTER = Counter("ai_model_invocations_total", "AI model usage", ["model", "decision"])
-AI_GUARD_COUNTER = Counter("ai_cost_guard_total", "AI cost guard actions", ["action"])
-ORDER_COUNTER = Counter("orders_total", "Number of broker orders", ["side", "type"])
-SCHEDULER_TICK_COUNTER = Counter("scheduler_ticks_total", "Scheduler ticks", ["job"])
-WS_BROADCAST_COUNTER = Counter("ws_broadcast_total", "Websocket broadcasts", ["channel"])
-COST_REMAINING_GAUGE = Gauge("ai_cost_remaining", "Remaining AI cost", ["currency"])
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+OVERFLOW_LABEL = "__overflow__"
+
+
+class BoundedLabels:
+    # caches bound children so hot paths skip prometheus' label lookup, and folds
+    # anything past max_series into a single overflow series
+    def __init__(self, metric: Any, max_series: int = 100) -> None:
+        self.metric = metric
+        self.max_series = max_series
+        self.children: Dict[Tuple[str, ...], Any] = {}
+        self.lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        child = self.children.get(values)
+        if child is None:
+            child = self._bind(values)
+        return child
+
+    def _bind(self, values: Tuple[Any, ...]) -> Any:
+        with self.lock:
+            child = self.children.get(values)
+            if child is not None:
+                return child
+            if len(self.children) >= self.max_series:
+                overflow = (OVERFLOW_LABEL,) * len(values)
+                child = self.children.get(overflow)
+                if child is None:
+                    child = self.children[overflow] = self.metric.labels(*overflow)
+                return child
+            child = self.children[values] = self.metric.labels(*(str(value) for value in values))
+            return child
+
+
+REQUEST_COUNTER = BoundedLabels(
+    Counter("app_requests_total", "Number of HTTP requests", ["route", "method", "status"]),
+    max_series=500,
+)
+REQUEST_LATENCY = BoundedLabels(
+    Histogram(
+        "app_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["route", "status"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    max_series=300,
+)
+AI_MODEL_COUNTER = BoundedLabels(
+    Counter("ai_model_invocations_total", "AI model usage", ["model", "decision"]),
+    max_series=50,
+)
+AI_GUARD_COUNTER = BoundedLabels(Counter("ai_cost_guard_total", "AI cost guard actions", ["action"]), max_series=4)
+ORDER_COUNTER = BoundedLabels(Counter("orders_total", "Number of broker orders", ["side", "type"]), max_series=20)
+CONDITIONAL_COUNTER = BoundedLabels(
+    Counter("conditional_orders_total", "Conditional order lifecycle events", ["kind", "event"]),
+    max_series=30,
+)
+SCHEDULER_TICK_COUNTER = BoundedLabels(Counter("scheduler_ticks_total", "Scheduler ticks", ["job"]), max_series=10)
+WS_BROADCAST_COUNTER = BoundedLabels(Counter("ws_broadcast_total", "Websocket broadcasts", ["channel"]), max_series=20)
+COST_REMAINING_GAUGE = Gauge("ai_cost_remaining", "Remaining AI cost", ["currency"], multiprocess_mode="livemin")
+DECISION_CACHE_COUNTER = BoundedLabels(
+    Counter("ai_decision_cache_total", "AI decision cache lookups", ["result"]),
+    max_series=4,
+)
+DECISION_CACHE_SAVED_USD = Counter("ai_decision_cache_saved_usd_total", "AI cost avoided by decision cache hits")
+DECISION_CACHE_HIT_RATIO = Gauge("ai_decision_cache_hit_ratio", "AI decision cache hit ratio", multiprocess_mode="liveall")
+STREAM_TICK_COUNTER = BoundedLabels(Counter("stream_ticks_total", "Ticks offered to the streaming runtime", ["result"]), max_series=4)
+STREAM_SIGNAL_COUNTER = BoundedLabels(
+    Counter("stream_signals_total", "Streaming strategy signals", ["strategy", "outcome"]),
+    max_series=40,
+)
+STREAM_QUEUE_DEPTH = Gauge("stream_queue_depth", "Ticks waiting in the streaming runtime queue", multiprocess_mode="livesum")
+ROUTED_ORDER_COUNTER = BoundedLabels(
+    Counter("router_orders_total", "Order legs sent by the smart order router", ["venue", "side"]),
+    max_series=40,
+)
+VENUE_LATENCY = BoundedLabels(
+    Histogram(
+        "venue_request_seconds",
+        "Venue quote and order latency",
+        ["venue", "op"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    ),
+    max_series=40,
+)
+ROUTER_DECISION_SECONDS = Histogram(
+    "router_decision_seconds",
+    "Time spent computing a routing plan, excluding network",
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+LOOP_SLOW_CALLBACK_COUNTER = Counter("event_loop_slow_callbacks_total", "Event loop stalls longer than the threshold")
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual event loop wake-ups",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+TICK_TO_TRADE = BoundedLabels(
+    Histogram(
+        "stream_tick_to_trade_seconds",
+        "Latency from tick arrival to each streaming runtime stage",
+        ["stage"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    ),
+    max_series=4,
+)
 
 EXECUTION_DURATION = Histogram(
     "ai_execution_seconds",
@@ -21,10 +122,34 @@ EXECUTION_DURATION = Histogram(
 )
 
 
+def observe_request(route: str, method: str, status: int, duration: float) -> None:
+    code = str(status)
+    REQUEST_COUNTER.labels(route, method, code).inc()
+    REQUEST_LATENCY.labels(route, code).observe(duration)
+
+
+def _registry() -> CollectorRegistry:
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    # each scrape aggregates the per-worker files so every worker reports the same totals
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
 def metrics_response() -> Response:
-    payload = generate_latest()
+    payload = generate_latest(_registry())
     return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
 
 
+def mark_process_dead() -> None:
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(os.getpid())
+
+
 def record_cost_remaining(amount: float) -> None:
     COST_REMAINING_GAUGE.labels(currency="USD").set(amount)
@@ -4,7 +4,7 @@ from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
-from .env import env_manager
+from .env import EnvConfig, env_manager
 
 
 @dataclass
@@ -20,14 +20,25 @@ class RiskManager:
         self.config = config or RiskConfig()
         self.last_trade_at: Optional[datetime] = None
         self.daily_loss: float = 0.0
-        self.max_equity: float = float(env_manager.get("TOTAL_CAPITAL_USDT", "20000") or 20000)
+        self.max_equity: float = env_manager.config.total_capital_usdt or 20000.0
         self.current_equity: float = self.max_equity
         self.exposure: Dict[str, float] = {}
+        self.exposure_limit: float = 0.0
+        self.daily_limit: float = 0.0
+        self.version = 0
+        self._refresh_limits(env_manager.config)
+        env_manager.subscribe(self._refresh_limits)
+
+    def _refresh_limits(self, config: EnvConfig) -> None:
+        self.exposure_limit = config.total_capital_usdt * self.config.max_exposure_pct
+        self.daily_limit = config.daily_invest_limit_usdt
+        self.version += 1
 
     def reset_day(self) -> None:
         self.daily_loss = 0.0
         self.last_trade_at = None
         self.exposure.clear()
+        self.version += 1
 
     def evaluate_order(self, symbol: str, size_usd: float) -> Dict[str, Any]:
         reasons = []
@@ -35,13 +46,10 @@ class RiskManager:
         cooldown = timedelta(seconds=self.config.cooldown_seconds)
         if self.last_trade_at and now - self.last_trade_at < cooldown:
             reasons.append("cooldown")
-        total_capital = float(env_manager.get("TOTAL_CAPITAL_USDT", "0") or 0)
-        exposure_limit = total_capital * self.config.max_exposure_pct
         exposure_after = self.exposure.get(symbol, 0.0) + size_usd
-        if exposure_after > exposure_limit:
+        if exposure_after > self.exposure_limit:
             reasons.append("exposure")
-        daily_limit = float(env_manager.get("DAILY_INVEST_LIMIT_USDT", "0") or 0)
-        if daily_limit and self.daily_loss >= daily_limit:
+        if self.daily_limit and self.daily_loss >= self.daily_limit:
             reasons.append("daily_limit")
         allowed = not reasons
         return {"allowed": allowed, "reasons": reasons}
@@ -53,6 +61,7 @@ class RiskManager:
         self.exposure[symbol] = max(self.exposure.get(symbol, 0.0) + size_usd, 0.0)
         if self.current_equity > self.max_equity:
             self.max_equity = self.current_equity
+        self.version += 1
 
     def status(self) -> Dict[str, Any]:
         drawdown = 0.0
@@ -70,6 +79,7 @@ class RiskManager:
         for field in payload:
             if hasattr(self.config, field):
                 setattr(self.config, field, payload[field])
+        self._refresh_limits(env_manager.config)
         return self.config
 
 
@@ -2,20 +2,22 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
-
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from .ai import ai_engine
 from .audit import log_event
 from .cost import cost_manager
 from .metrics import SCHEDULER_TICK_COUNTER
 
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
 
 class AutopilotController:
     def __init__(self) -> None:
-        self.scheduler = AsyncIOScheduler(timezone=timezone.utc)
+        self.scheduler: Optional["AsyncIOScheduler"] = None
         self.job = None
+        self.version = 0
         self.state: Dict[str, Any] = {
             "active": False,
             "interval": 60,
@@ -27,19 +29,25 @@ class AutopilotController:
         }
 
     async def initialize(self) -> None:
+        if self.scheduler is None:
+            from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+            self.scheduler = AsyncIOScheduler(timezone=timezone.utc)
         if not self.scheduler.running:
             self.scheduler.start()
 
     async def shutdown(self) -> None:
-        if self.scheduler.running:
+        if self.scheduler is not None and self.scheduler.running:
             self.scheduler.shutdown(wait=False)
         self.job = None
         self.state["active"] = False
         self.state["next_run"] = None
+        self.version += 1
 
     async def _run_job(self) -> None:
-        SCHEDULER_TICK_COUNTER.labels(job="autopilot").inc()
+        SCHEDULER_TICK_COUNTER.labels("autopilot").inc()
         self.state["last_run"] = datetime.now(timezone.utc).isoformat()
+        self.version += 1
         try:
             result = await ai_engine.execute_autopilot()
             self.state["daily_cost"] = result.get("daily_cost", self.state["daily_cost"])
@@ -54,6 +62,7 @@ class AutopilotController:
             if self.job:
                 next_run = self.job.next_run_time
                 self.state["next_run"] = next_run.isoformat() if next_run else None
+            self.version += 1
 
     async def start(self, interval: Optional[int] = None) -> Dict[str, Any]:
         await self.initialize()
@@ -72,6 +81,7 @@ class AutopilotController:
         self.state["active"] = True
         next_run = self.job.next_run_time
         self.state["next_run"] = next_run.isoformat() if next_run else None
+        self.version += 1
         log_event("autopilot_start", {"interval": self.state["interval"]})
         return self.state
 
@@ -81,6 +91,7 @@ class AutopilotController:
             self.job = None
         self.state["active"] = False
         self.state["next_run"] = None
+        self.version += 1
         log_event("autopilot_stop")
         return self.state
 
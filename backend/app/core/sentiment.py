@@ -1,21 +1,300 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import math
 import re
-from typing import Dict
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional
 
-POSITIVE = {"bullish", "buy", "long", "positive", "up"}
-NEGATIVE = {"bearish", "sell", "short", "negative", "down"}
+from .sentiment_store import parse_ts, sentiment_series
 
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
-def aggregate_sentiment(text: str) -> Dict[str, float]:
-    tokens = re.findall(r"[a-zA-Z]+", text.lower())
-    pos = sum(1 for token in tokens if token in POSITIVE)
-    neg = sum(1 for token in tokens if token in NEGATIVE)
-    total = max(len(tokens), 1)
-    score = (pos - neg) / total
-    label = "neutral"
+ROOT_DIR = Path(__file__).resolve().parents[2]
+NEWS_DIR = ROOT_DIR / "storage" / "news"
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+SYMBOL_PATTERN = re.compile(r"\b(btc|bitcoin|eth|ether|ethereum|sol|solana|ltc|litecoin)\b")
+SYMBOL_ALIASES = {
+    "btc": "BTC-USDT",
+    "bitcoin": "BTC-USDT",
+    "eth": "ETH-USDT",
+    "ether": "ETH-USDT",
+    "ethereum": "ETH-USDT",
+    "sol": "SOL-USDT",
+    "solana": "SOL-USDT",
+    "ltc": "LTC-USDT",
+    "litecoin": "LTC-USDT",
+}
+
+LEXICON: Dict[str, float] = {
+    "bullish": 1.0,
+    "buy": 0.6,
+    "long": 0.5,
+    "positive": 0.6,
+    "up": 0.3,
+    "rally": 0.8,
+    "surge": 0.8,
+    "breakout": 0.7,
+    "gain": 0.5,
+    "gains": 0.5,
+    "pump": 0.6,
+    "moon": 0.7,
+    "adoption": 0.5,
+    "approval": 0.6,
+    "bearish": -1.0,
+    "sell": -0.6,
+    "short": -0.5,
+    "negative": -0.6,
+    "down": -0.3,
+    "crash": -1.0,
+    "dump": -0.8,
+    "plunge": -0.9,
+    "drop": -0.5,
+    "hack": -0.9,
+    "exploit": -0.9,
+    "liquidation": -0.6,
+    "liquidations": -0.6,
+    "fud": -0.5,
+    "ban": -0.7,
+}
+POSITIVE = frozenset(token for token, weight in LEXICON.items() if weight > 0)
+NEGATIVE = frozenset(token for token, weight in LEXICON.items() if weight < 0)
+NEGATIONS = frozenset({"not", "no", "never", "without", "hardly", "don't", "isn't", "wasn't", "aren't", "won't"})
+NEGATION_WINDOW = 3
+CLAUSE_BREAKS = frozenset(".,;:!?")
+
+PARALLEL_THRESHOLD = 2000
+CHUNK_SIZE = 500
+# ingest chunks must clear PARALLEL_THRESHOLD (with room for skipped lines) to reach the pool
+INGEST_CHUNK_LINES = 2 * PARALLEL_THRESHOLD
+
+_pool: Optional["ProcessPoolExecutor"] = None
+
+
+def _label(score: float) -> str:
     if score > 0.1:
-        label = "bullish"
-    elif score < -0.1:
-        label = "bearish"
-    return {"label": label, "score": score, "tokens": len(tokens)}
+        return "bullish"
+    if score < -0.1:
+        return "bearish"
+    return "neutral"
+
+
+def score_text(text: str) -> Dict[str, Any]:
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    weight_of = LEXICON.get
+    total = 0.0
+    negate = 0
+    words = 0
+    for token in tokens:
+        if token in CLAUSE_BREAKS:
+            negate = 0
+            continue
+        words += 1
+        if token in NEGATIONS:
+            negate = NEGATION_WINDOW
+            continue
+        weight = weight_of(token)
+        if weight is not None:
+            total += -weight if negate else weight
+        if negate:
+            negate -= 1
+    score = total / max(words, 1)
+    return {"label": _label(score), "score": score, "tokens": words}
+
+
+def aggregate_sentiment(text: str) -> Dict[str, Any]:
+    return score_text(text)
+
+
+def detect_symbols(text: str) -> List[str]:
+    return sorted({SYMBOL_ALIASES[match] for match in SYMBOL_PATTERN.findall(text.lower())})
+
+
+def score_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    return [score_text(text) for text in texts]
+
+
+def _executor() -> "ProcessPoolExecutor":
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        _pool = ProcessPoolExecutor()
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def score_documents(texts: List[str]) -> List[Dict[str, Any]]:
+    if len(texts) < PARALLEL_THRESHOLD:
+        return score_batch(texts)
+    loop = asyncio.get_running_loop()
+    pool = _executor()
+    chunks = [texts[i : i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+    results = await asyncio.gather(*(loop.run_in_executor(pool, score_batch, chunk) for chunk in chunks))
+    return [item for chunk in results for item in chunk]
+
+
+@dataclass
+class DecayedScore:
+    weighted_sum: float
+    weight: float
+    updated_at: float
+    documents: int = 1
+
+
+class RollingSentiment:
+    def __init__(self, half_life_seconds: float = 3600.0) -> None:
+        self.decay = math.log(2) / half_life_seconds
+        self.scores: Dict[str, DecayedScore] = {}
+
+    def update(self, symbol: str, score: float, ts: Optional[float] = None) -> None:
+        ts = ts or time.time()
+        state = self.scores.get(symbol)
+        if state is None:
+            self.scores[symbol] = DecayedScore(score, 1.0, ts)
+            return
+        if ts >= state.updated_at:
+            factor = math.exp(-self.decay * (ts - state.updated_at))
+            state.weighted_sum = state.weighted_sum * factor + score
+            state.weight = state.weight * factor + 1.0
+            state.updated_at = ts
+        else:
+            factor = math.exp(-self.decay * (state.updated_at - ts))
+            state.weighted_sum += score * factor
+            state.weight += factor
+        state.documents += 1
+
+    def snapshot(self, symbol: str, now: Optional[float] = None) -> Dict[str, Any]:
+        state = self.scores.get(symbol)
+        if state is None:
+            return {"symbol": symbol, "label": "neutral", "score": 0.0, "weight": 0.0, "documents": 0}
+        now = now or time.time()
+        score = state.weighted_sum / state.weight if state.weight else 0.0
+        weight = state.weight * math.exp(-self.decay * max(now - state.updated_at, 0.0))
+        return {
+            "symbol": symbol,
+            "label": _label(score),
+            "score": score,
+            "weight": weight,
+            "documents": state.documents,
+        }
+
+    def summary(self, symbols: Iterable[str]) -> Dict[str, Any]:
+        now = time.time()
+        total = 0.0
+        weight = 0.0
+        for symbol in symbols:
+            snap = self.snapshot(symbol, now)
+            total += snap["score"] * snap["weight"]
+            weight += snap["weight"]
+        score = total / weight if weight else 0.0
+        return {"label": _label(score), "score": score, "weight": weight}
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {symbol: self.snapshot(symbol, now) for symbol in self.scores}
+
+
+rolling_sentiment = RollingSentiment()
+
+
+def _normalize(document: Any) -> Dict[str, Any]:
+    if isinstance(document, str):
+        return {"text": document}
+    return dict(document)
+
+
+def _document_symbols(document: Dict[str, Any]) -> List[str]:
+    symbols = document.get("symbols") or document.get("symbol") or []
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    return list(symbols) or detect_symbols(document.get("text", ""))
+
+
+async def score_and_track(documents: List[Any]) -> List[Dict[str, Any]]:
+    docs = [_normalize(document) for document in documents]
+    results = await score_documents([doc.get("text", "") for doc in docs])
+    now = time.time()
+    for doc, result in zip(docs, results):
+        symbols = _document_symbols(doc)
+        try:
+            ts = parse_ts(doc["ts"], now) if doc.get("ts") else now
+        except ValueError as exc:
+            result["symbols"] = []
+            result["error"] = str(exc)
+            continue
+        for symbol in symbols:
+            rolling_sentiment.update(symbol, result["score"], ts)
+            sentiment_series.record(symbol, result["score"], ts)
+        result["symbols"] = symbols
+    return results
+
+
+def _read_lines(handle: Any, count: int) -> List[str]:
+    lines = []
+    for _ in range(count):
+        line = handle.readline()
+        if not line:
+            break
+        lines.append(line)
+    return lines
+
+
+def resolve_news_path(name: str) -> Path:
+    path = (NEWS_DIR / name).resolve()
+    if NEWS_DIR.resolve() not in path.parents:
+        raise ValueError("path must be inside storage/news")
+    if not path.is_file():
+        raise ValueError(f"{name} not found")
+    return path
+
+
+async def iter_documents(path: Path, chunk_lines: int = INGEST_CHUNK_LINES) -> AsyncIterator[List[Dict[str, Any]]]:
+    is_jsonl = path.suffix == ".jsonl"
+    with path.open("r", encoding="utf-8") as handle:
+        while True:
+            lines = await asyncio.to_thread(_read_lines, handle, chunk_lines)
+            if not lines:
+                break
+            chunk = []
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                if is_jsonl:
+                    try:
+                        chunk.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+                else:
+                    chunk.append({"text": line})
+            yield chunk
+
+
+async def ingest_file(name: str) -> Dict[str, Any]:
+    path = resolve_news_path(name)
+    started = time.perf_counter()
+    documents = 0
+    touched = set()
+    async for chunk in iter_documents(path):
+        results = await score_and_track(chunk)
+        documents += len(results)
+        for result in results:
+            touched.update(result["symbols"])
+    return {
+        "file": path.name,
+        "documents": documents,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+        "symbols": {symbol: rolling_sentiment.snapshot(symbol) for symbol in sorted(touched)},
+    }
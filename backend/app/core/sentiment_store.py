@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+MINUTE = 60
+HOUR = 3600
+RESOLUTIONS = {"minute": MINUTE, "hour": HOUR}
+MINUTE_RETENTION_SECONDS = 2 * 24 * HOUR
+HOUR_RETENTION_SECONDS = 90 * 24 * HOUR
+COMPACT_INTERVAL_SECONDS = HOUR
+FUTURE_SKEW_SECONDS = 300
+
+
+def parse_ts(value: Any, now: Optional[float] = None) -> float:
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace(".", "", 1).isdigit()):
+        ts = float(value)
+        ts = ts / 1000 if ts > 1e12 else ts
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError as exc:
+            raise ValueError(f"invalid timestamp {value!r}") from exc
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        ts = parsed.timestamp()
+    if not math.isfinite(ts) or ts <= 0:
+        raise ValueError(f"invalid timestamp {value!r}")
+    if ts > (now or time.time()) + FUTURE_SKEW_SECONDS:
+        raise ValueError(f"timestamp {value!r} is in the future")
+    return ts
+
+
+@dataclass
+class Rollup:
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+
+    def add(self, score: float) -> None:
+        self.count += 1
+        self.total += score
+        self.total_sq += score * score
+
+    def merge(self, other: "Rollup") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def summary(self) -> Dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        variance = self.total_sq / self.count - mean * mean if self.count else 0.0
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": mean,
+            "std": math.sqrt(max(variance, 0.0)),
+        }
+
+
+class SentimentSeries:
+    def __init__(
+        self,
+        minute_retention: int = MINUTE_RETENTION_SECONDS,
+        hour_retention: int = HOUR_RETENTION_SECONDS,
+    ) -> None:
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+        self.minutes: Dict[str, Dict[int, Rollup]] = {}
+        self.hours: Dict[str, Dict[int, Rollup]] = {}
+        self.last_compacted = time.time()
+
+    def record(self, symbol: str, score: float, ts: Any = None) -> None:
+        now = time.time()
+        ts = parse_ts(ts, now) if ts else now
+        minute = int(ts) // MINUTE * MINUTE
+        hour = int(ts) // HOUR * HOUR
+        self.minutes.setdefault(symbol, {}).setdefault(minute, Rollup()).add(score)
+        self.hours.setdefault(symbol, {}).setdefault(hour, Rollup()).add(score)
+        if now - self.last_compacted > COMPACT_INTERVAL_SECONDS:
+            self.compact(now)
+
+    def symbols(self) -> List[str]:
+        return sorted(self.hours)
+
+    def window(self, symbol: str, seconds: int, now: Optional[float] = None) -> Dict[str, Any]:
+        end = int(now or time.time())
+        start = end - seconds
+        minutes = self.minutes.get(symbol, {})
+        hours = self.hours.get(symbol, {})
+        rollup = Rollup()
+        first_full_hour = -(-start // HOUR) * HOUR
+        last_full_hour = end // HOUR * HOUR
+        if seconds > self.minute_retention:
+            # older minutes are compacted away; the partial hour at `end` comes from minute buckets
+            hour_range = range(start // HOUR * HOUR, last_full_hour, HOUR)
+            minute_ranges: List[Tuple[int, int]] = [(last_full_hour, end + 1)]
+        elif first_full_hour < last_full_hour:
+            hour_range = range(first_full_hour, last_full_hour, HOUR)
+            minute_ranges = [(start, first_full_hour), (last_full_hour, end + 1)]
+        else:
+            hour_range = range(0)
+            minute_ranges = [(start, end + 1)]
+        for bucket in hour_range:
+            hour_rollup = hours.get(bucket)
+            if hour_rollup:
+                rollup.merge(hour_rollup)
+        for range_start, range_end in minute_ranges:
+            for bucket in range(range_start // MINUTE * MINUTE, range_end, MINUTE):
+                minute_rollup = minutes.get(bucket)
+                if minute_rollup:
+                    rollup.merge(minute_rollup)
+        summary = rollup.summary()
+        summary.update({"symbol": symbol, "window": seconds, "start": start, "end": end})
+        return summary
+
+    def buckets(
+        self,
+        symbol: str,
+        resolution: str = "minute",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        store = self.hours if resolution == "hour" else self.minutes
+        series = store.get(symbol, {})
+        rows = []
+        for bucket in sorted(series):
+            if start is not None and bucket < start:
+                continue
+            if end is not None and bucket >= end:
+                continue
+            row = series[bucket].summary()
+            row["ts"] = bucket
+            rows.append(row)
+        return rows
+
+    def compact(self, now: Optional[float] = None) -> Dict[str, int]:
+        now = now or time.time()
+        self.last_compacted = now
+        dropped = {"minute": 0, "hour": 0}
+        for resolution, store, retention in (
+            ("minute", self.minutes, self.minute_retention),
+            ("hour", self.hours, self.hour_retention),
+        ):
+            cutoff = now - retention
+            for symbol in list(store):
+                series = store[symbol]
+                stale = [bucket for bucket in series if bucket < cutoff]
+                for bucket in stale:
+                    del series[bucket]
+                dropped[resolution] += len(stale)
+                if not series:
+                    del store[symbol]
+        return dropped
+
+    def align(self, symbol: str, timestamps: Any, resolution: str = "hour") -> Dict[str, Any]:
+        import numpy as np
+
+        step = RESOLUTIONS.get(resolution, HOUR)
+        store = self.hours if resolution == "hour" else self.minutes
+        # copy first: backtests align from a worker thread while the loop keeps recording
+        series = dict(store.get(symbol, {}))
+        ts = np.asarray(timestamps, dtype=np.int64)
+        if not series or ts.size == 0:
+            return {"mean": np.zeros(ts.size), "count": np.zeros(ts.size, dtype=np.int64)}
+        keys = np.fromiter(sorted(series), dtype=np.int64, count=len(series))
+        totals = np.fromiter((series[k].total for k in keys.tolist()), dtype=np.float64, count=keys.size)
+        counts = np.fromiter((series[k].count for k in keys.tolist()), dtype=np.int64, count=keys.size)
+        cum_totals = np.concatenate(([0.0], np.cumsum(totals)))
+        cum_counts = np.concatenate(([0], np.cumsum(counts)))
+        # a bucket only counts once it has closed (key + step <= ts), so candles see no later documents
+        closed = ts - step
+        bounds = np.concatenate(([closed[0] - step], closed))
+        idx = np.searchsorted(keys, bounds, side="right")
+        window_totals = cum_totals[idx[1:]] - cum_totals[idx[:-1]]
+        window_counts = cum_counts[idx[1:]] - cum_counts[idx[:-1]]
+        mean = np.divide(window_totals, window_counts, out=np.zeros(ts.size), where=window_counts > 0)
+        return {"mean": mean, "count": window_counts}
+
+
+sentiment_series = SentimentSeries()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+LAZY_MODULES = ("numpy", "pandas", "httpx", "sentry_sdk", "apscheduler")
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_at: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                "offset_ms": (start - self.started_at) * 1000,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+            })
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "phases": self.phases,
+            "ready_ms": (self.ready_at - self.started_at) * 1000 if self.ready_at else None,
+            "modules_loaded": len(sys.modules),
+            "lazy_modules": {name: name in sys.modules for name in LAZY_MODULES},
+            "max_rss_mb": _rss_mb(),
+        }
+
+
+def import_time_report(module: str = "app.main", top: int = 25) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(parts[0]) / 1000,
+            "cumulative_ms": int(parts[1]) / 1000,
+        })
+    top_level = [row for row in rows if row["depth"] == 0]
+    return {
+        "module": module,
+        "total_ms": sum(row["cumulative_ms"] for row in top_level),
+        "modules": len(rows),
+        "slowest": sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top],
+        "returncode": result.returncode,
+    }
+
+
+startup_profiler = StartupProfiler()
+
+
+if __name__ == "__main__":
+    report = import_time_report(sys.argv[1] if len(sys.argv) > 1 else "app.main")
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms across {report['modules']} modules")
+    for row in report["slowest"]:
+        print(f"{row['cumulative_ms']:10.1f} ms  {row['self_ms']:8.1f} ms  {row['module']}")
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple, Type
+
+from .ai import ai_engine
+from .audit import log_event
+from .conditional import conditional_engine
+from .decision_cache import decision_cache
+from .env import env_manager
+from .metrics import STREAM_QUEUE_DEPTH, STREAM_SIGNAL_COUNTER, STREAM_TICK_COUNTER, TICK_TO_TRADE
+from .sentiment import rolling_sentiment
+from .ws_hub import ws_hub
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+FEEDS_DIR = ROOT_DIR / "storage" / "feeds"
+QUEUE_SIZE = 10000
+BATCH_SIZE = 256
+BATCH_WINDOW_SECONDS = 0.005
+LATENCY_WINDOW = 1000
+REPLAY_READ_BYTES = 1 << 20
+
+
+class FeedRecordError(ValueError):
+    pass
+
+
+@dataclass
+class Tick:
+    symbol: str
+    price: float
+    size: float = 0.0
+    ts: float = 0.0
+    received_at: float = field(default_factory=time.perf_counter)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Tick":
+        symbol = payload.get("instId") or payload.get("symbol")
+        price = payload.get("px", payload.get("last", payload.get("price")))
+        if not symbol or price is None:
+            raise ValueError("tick needs instId and px")
+        ts = float(payload.get("ts") or 0)
+        return cls(
+            symbol=str(symbol),
+            price=float(price),
+            size=float(payload.get("sz") or payload.get("size") or 0),
+            ts=ts / 1000 if ts > 1e12 else ts,
+        )
+
+
+@dataclass
+class Signal:
+    strategy: str
+    symbol: str
+    side: str
+    price: float
+    reason: str
+    received_at: float
+
+
+class StreamStrategy:
+    name = "base"
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None, debounce_seconds: float = 30.0) -> None:
+        self.symbols = set(symbols) if symbols else None
+        self.debounce_seconds = debounce_seconds
+        self.ticks = 0
+
+    def wants(self, symbol: str) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    def on_tick(self, tick: Tick) -> Optional[Signal]:
+        raise NotImplementedError
+
+    def state(self) -> Dict[str, Any]:
+        return {"ticks": self.ticks}
+
+
+class BreakoutStrategy(StreamStrategy):
+    name = "breakout"
+
+    def __init__(self, window: int = 50, threshold: float = 0.002, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.window = window
+        self.threshold = threshold
+        # monotonic deques of (seq, price) give O(1) amortised rolling max/min per symbol
+        self.highs: Dict[str, Deque[Tuple[int, float]]] = {}
+        self.lows: Dict[str, Deque[Tuple[int, float]]] = {}
+        self.seqs: Dict[str, int] = {}
+
+    def on_tick(self, tick: Tick) -> Optional[Signal]:
+        self.ticks += 1
+        seq = self.seqs[tick.symbol] = self.seqs.get(tick.symbol, -1) + 1
+        highs = self.highs.setdefault(tick.symbol, deque())
+        lows = self.lows.setdefault(tick.symbol, deque())
+        while highs and highs[0][0] <= seq - self.window:
+            highs.popleft()
+        while lows and lows[0][0] <= seq - self.window:
+            lows.popleft()
+        signal = None
+        if highs and tick.price > highs[0][1] * (1 + self.threshold):
+            signal = Signal(self.name, tick.symbol, "buy", tick.price, "breakout_high", tick.received_at)
+        elif lows and tick.price < lows[0][1] * (1 - self.threshold):
+            signal = Signal(self.name, tick.symbol, "sell", tick.price, "breakout_low", tick.received_at)
+        while highs and highs[-1][1] <= tick.price:
+            highs.pop()
+        highs.append((seq, tick.price))
+        while lows and lows[-1][1] >= tick.price:
+            lows.pop()
+        lows.append((seq, tick.price))
+        return signal
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "range": {symbol: [self.lows[symbol][0][1], highs[0][1]] for symbol, highs in self.highs.items() if highs},
+        }
+
+
+class MomentumStrategy(StreamStrategy):
+    name = "momentum"
+
+    def __init__(self, fast: int = 12, slow: int = 48, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.fast_alpha = 2 / (fast + 1)
+        self.slow_alpha = 2 / (slow + 1)
+        self.emas: Dict[str, Tuple[float, float]] = {}
+
+    def on_tick(self, tick: Tick) -> Optional[Signal]:
+        self.ticks += 1
+        previous = self.emas.get(tick.symbol)
+        if previous is None:
+            self.emas[tick.symbol] = (tick.price, tick.price)
+            return None
+        fast = previous[0] + self.fast_alpha * (tick.price - previous[0])
+        slow = previous[1] + self.slow_alpha * (tick.price - previous[1])
+        self.emas[tick.symbol] = (fast, slow)
+        if previous[0] <= previous[1] and fast > slow:
+            return Signal(self.name, tick.symbol, "buy", tick.price, "ema_cross_up", tick.received_at)
+        if previous[0] >= previous[1] and fast < slow:
+            return Signal(self.name, tick.symbol, "sell", tick.price, "ema_cross_down", tick.received_at)
+        return None
+
+    def state(self) -> Dict[str, Any]:
+        return {"ticks": self.ticks, "ema": {symbol: {"fast": f, "slow": s} for symbol, (f, s) in self.emas.items()}}
+
+
+STREAM_STRATEGIES: Dict[str, Type[StreamStrategy]] = {
+    BreakoutStrategy.name: BreakoutStrategy,
+    MomentumStrategy.name: MomentumStrategy,
+}
+
+
+def _percentile(samples: Iterable[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(pct * len(ordered)), len(ordered) - 1)] * 1000 if ordered else 0.0
+
+
+class StrategyRuntime:
+    def __init__(self, queue_size: int = QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.strategies: Dict[str, StreamStrategy] = {}
+        self.batch_size = BATCH_SIZE
+        self.batch_window = BATCH_WINDOW_SECONDS
+        self.last_emit: Dict[Tuple[str, str], float] = {}
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.counters: Dict[str, int] = {"accepted": 0, "dropped": 0, "batches": 0, "signals": 0, "debounced": 0, "orders": 0}
+        self.version = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def register(self, strategy: StreamStrategy) -> None:
+        self.strategies[strategy.name] = strategy
+        self.version += 1
+
+    def unregister(self, name: str) -> None:
+        self.strategies.pop(name, None)
+        self.version += 1
+
+    async def start(
+        self,
+        strategies: Optional[Dict[str, Dict[str, Any]]] = None,
+        batch_size: Optional[int] = None,
+        batch_window: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        for name, options in (strategies or {}).items():
+            if name not in STREAM_STRATEGIES:
+                raise ValueError(f"unknown stream strategy {name}")
+            self.register(STREAM_STRATEGIES[name](**(options or {})))
+        if batch_size:
+            self.batch_size = max(int(batch_size), 1)
+        if batch_window is not None:
+            self.batch_window = max(float(batch_window), 0.0)
+        if self._task is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.get_running_loop().create_task(self._consume())
+        self.version += 1
+        log_event("stream_start", {"strategies": list(self.strategies), "batch_size": self.batch_size})
+        return self.status()
+
+    async def stop(self) -> Dict[str, Any]:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.queue = None
+            STREAM_QUEUE_DEPTH.set(0)
+            self.version += 1
+            log_event("stream_stop", dict(self.counters))
+        return self.status()
+
+    async def publish(self, tick: Tick, block: bool = False) -> bool:
+        if self.queue is None:
+            raise RuntimeError("streaming runtime is not running")
+        if block:
+            await self.queue.put(tick)
+        elif self.queue.full():
+            # live feeds never wait: shed the oldest tick so evaluation works on fresh prices
+            self.queue.get_nowait()
+            self.queue.put_nowait(tick)
+            self.counters["dropped"] += 1
+            STREAM_TICK_COUNTER.labels("dropped").inc()
+        else:
+            self.queue.put_nowait(tick)
+        self.counters["accepted"] += 1
+        STREAM_TICK_COUNTER.labels("accepted").inc()
+        return True
+
+    async def _next_batch(self) -> List[Tick]:
+        queue = self.queue
+        batch = [await queue.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.batch_size:
+            if queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+                continue
+            batch.append(queue.get_nowait())
+        STREAM_QUEUE_DEPTH.set(queue.qsize())
+        return batch
+
+    async def _consume(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._process(batch)
+            except Exception:  # pragma: no cover - safeguard
+                logger.exception("Streaming runtime failed to process a batch")
+
+    async def _process(self, batch: List[Tick]) -> None:
+        self.counters["batches"] += 1
+        latest: Dict[str, Tick] = {}
+        signals: Dict[Tuple[str, str], Signal] = {}
+        for tick in batch:
+            latest[tick.symbol] = tick
+            decision_cache.market.observe(tick.symbol, tick.price, tick.ts)
+            for strategy in self.strategies.values():
+                if not strategy.wants(tick.symbol):
+                    continue
+                signal = strategy.on_tick(tick)
+                if signal is not None:
+                    signals[(signal.strategy, signal.symbol)] = signal
+        now = time.perf_counter()
+        for tick in latest.values():
+            TICK_TO_TRADE.labels("evaluate").observe(now - tick.received_at)
+            await conditional_engine.on_tick(tick.symbol, tick.price)
+        for key, signal in signals.items():
+            self.counters["signals"] += 1
+            debounce = self.strategies[signal.strategy].debounce_seconds
+            last = self.last_emit.get(key)
+            if last is not None and now - last < debounce:
+                self.counters["debounced"] += 1
+                STREAM_SIGNAL_COUNTER.labels(signal.strategy, "debounced").inc()
+                continue
+            self.last_emit[key] = now
+            STREAM_SIGNAL_COUNTER.labels(signal.strategy, "emitted").inc()
+            await self._act(signal)
+
+    async def _act(self, signal: Signal) -> None:
+        universe = [signal.symbol]
+        context = {
+            "universe": universe,
+            "sentiment": rolling_sentiment.summary(universe),
+            "signal": asdict(signal),
+            "side": signal.side,
+            # a signal trades one clip, not the whole book
+            "capital": env_manager.config.single_trade_limit_usdt,
+        }
+        decision = await ai_engine.decide(signal.strategy, context)
+        latency = time.perf_counter() - signal.received_at
+        TICK_TO_TRADE.labels("order").observe(latency)
+        self.latencies.append(latency)
+        self.counters["orders"] += sum(1 for order in decision.get("orders", []) if order.get("status") == "submitted")
+        self.version += 1
+        payload = {"signal": asdict(signal), "decision": decision, "tick_to_trade_ms": latency * 1000}
+        log_event("stream_signal", payload)
+        await ws_hub.broadcast("orders", {"type": "stream", "payload": payload})
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue": {"depth": self.queue.qsize() if self.queue else 0, "capacity": self.queue_size},
+            "batch": {"size": self.batch_size, "window_ms": self.batch_window * 1000},
+            "counters": dict(self.counters),
+            "tick_to_trade_ms": {
+                "p50": _percentile(self.latencies, 0.5),
+                "p99": _percentile(self.latencies, 0.99),
+                "samples": len(self.latencies),
+            },
+            "strategies": {
+                name: {"debounce_seconds": strategy.debounce_seconds, **strategy.state()}
+                for name, strategy in self.strategies.items()
+            },
+        }
+
+
+def resolve_feed_path(name: str) -> Path:
+    path = (FEEDS_DIR / name).resolve()
+    if FEEDS_DIR.resolve() not in path.parents:
+        raise ValueError("path must be inside storage/feeds")
+    if not path.is_file():
+        raise ValueError(f"{name} not found")
+    return path
+
+
+async def iter_recorded(path: Path) -> AsyncIterator[Tick]:
+    line_no = 0
+    with path.open("r", encoding="utf-8") as handle:
+        while True:
+            lines = await asyncio.to_thread(handle.readlines, REPLAY_READ_BYTES)
+            if not lines:
+                return
+            for line in lines:
+                line_no += 1
+                if not line.strip():
+                    continue
+                try:
+                    yield Tick.from_payload(json.loads(line))
+                except (AttributeError, TypeError, ValueError) as exc:
+                    raise FeedRecordError(f"{path.name} line {line_no}: {exc}") from exc
+
+
+async def replay(name: str, speed: float = 1.0, runtime: Optional[StrategyRuntime] = None) -> Dict[str, Any]:
+    # speed 0 replays as fast as the runtime accepts; otherwise recorded gaps are scaled by 1/speed
+    runtime = runtime or strategy_runtime
+    path = resolve_feed_path(name)
+    started = time.perf_counter()
+    first_ts: Optional[float] = None
+    count = 0
+    async for tick in iter_recorded(path):
+        if speed > 0 and tick.ts:
+            if first_ts is None:
+                first_ts = tick.ts
+            delay = (tick.ts - first_ts) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tick.ts = time.time()
+        tick.received_at = time.perf_counter()
+        await runtime.publish(tick, block=speed <= 0)
+        count += 1
+    return {"path": str(path.relative_to(ROOT_DIR)), "ticks": count, "seconds": time.perf_counter() - started}
+
+
+strategy_runtime = StrategyRuntime()
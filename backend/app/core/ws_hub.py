@@ -25,7 +25,7 @@ class WebSocketHub:
                     self.connections.pop(channel, None)
 
     async def broadcast(self, channel: str, message: dict) -> None:
-        WS_BROADCAST_COUNTER.labels(channel=channel).inc()
+        WS_BROADCAST_COUNTER.labels(channel).inc()
         async with self.lock:
             connections = list(self.connections.get(channel, set()))
         for connection in connections:
@@ -4,23 +4,28 @@ import logging
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from .core.env import env_manager
-from .core.metrics import REQUEST_COUNTER
-from .core.scheduler import autopilot_controller
-from .core.sentry import init_sentry
-from .routes import backtest, broker, env, ops, risk, sentiment, strategy, ws
+from .core.metrics import mark_process_dead, observe_request
+from .core.startup import startup_profiler
 
 logger = logging.getLogger(__name__)
 
+BOOT_ID = uuid.uuid4().hex[:8]
+_response_cache: Dict[str, Tuple[int, orjson.Fragment]] = {}
+
 
 def create_app() -> FastAPI:
-    init_sentry(env_manager.get("SENTRY_DSN"))
+    with startup_profiler.phase("sentry"):
+        from .core.sentry import init_sentry
+
+        init_sentry(env_manager.get("SENTRY_DSN"))
 
     app = FastAPI(title="AI Quant Trading", version="1.0.0")
 
@@ -48,17 +53,27 @@ def create_app() -> FastAPI:
             return response
         finally:
             duration = time.perf_counter() - start
-            REQUEST_COUNTER.labels(route=request.url.path).inc()
+            status = response.status_code if response is not None else 500
+            observe_request(_route_template(request), request.method, status, duration)
             logger.debug("Request %s finished in %.4fs", request_id, duration)
 
-    app.include_router(env.router, prefix="/api")
-    app.include_router(broker.router, prefix="/api")
-    app.include_router(risk.router, prefix="/api")
-    app.include_router(backtest.router, prefix="/api")
-    app.include_router(sentiment.router, prefix="/api")
-    app.include_router(strategy.router, prefix="/api")
-    app.include_router(ops.router)
-    app.include_router(ws.router)
+    with startup_profiler.phase("routes"):
+        from .core.conditional import conditional_engine
+        from .core.loop_monitor import loop_monitor
+        from .core.scheduler import autopilot_controller
+        from .core.sentiment import shutdown_pool
+        from .core.streaming import strategy_runtime
+        from .routes import backtest, broker, env, history, ops, risk, sentiment, strategy, ws
+
+        _include(app, env.router, "/api")
+        _include(app, broker.router, "/api")
+        _include(app, risk.router, "/api")
+        _include(app, backtest.router, "/api")
+        _include(app, history.router, "/api")
+        _include(app, sentiment.router, "/api")
+        _include(app, strategy.router, "/api")
+        _include(app, ops.router)
+        _include(app, ws.router)
 
     @app.get("/healthz", response_class=ORJSONResponse)
     async def healthz(request: Request) -> Dict[str, Any]:
@@ -67,15 +82,57 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def on_startup() -> None:
         logger.info("Starting application in %s mode", env_manager.mode)
-        await autopilot_controller.initialize()
+        loop_monitor.start()
+        with startup_profiler.phase("conditional_orders"):
+            await conditional_engine.initialize()
+        env_manager.start_watching()
+        startup_profiler.mark_ready()
 
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
         await autopilot_controller.shutdown()
+        await strategy_runtime.stop()
+        await env_manager.stop_watching()
+        await loop_monitor.stop()
+        shutdown_pool()
+        from .core.cost import cost_manager
+
+        await cost_manager.flush()
+        await conditional_engine.flush()
+        from .broker.okx import okx_broker
+        from .broker.registry import broker_registry
+
+        await broker_registry.close()
+        await okx_broker.close()
+        mark_process_dead()
 
     return app
 
 
+_ROUTE_PREFIXES: Dict[Any, str] = {}
+
+
+def _include(app: FastAPI, router: Any, prefix: str = "") -> None:
+    app.include_router(router, prefix=prefix)
+    for route in router.routes:
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is not None:
+            _ROUTE_PREFIXES[endpoint] = prefix
+
+
+def _route_template(request: Request) -> str:
+    # label by route template, never the raw path, to keep series bounded
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is not None and path_regex.match(request.scope["path"]):
+        return template
+    # included routers may report their template without the include prefix
+    return _ROUTE_PREFIXES.get(request.scope.get("endpoint"), "") + template
+
+
 def standard_response(
     request: Request,
     data: Optional[Any] = None,
@@ -94,4 +151,31 @@ def standard_response(
     return ORJSONResponse(status_code=status_code, content=payload)
 
 
-app = create_app()
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def cached_response(request: Request, key: str, version: int, build: Callable[[], Any]) -> Response:
+    etag = f'W/"{key}-{BOOT_ID}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] != version:
+        entry = (version, orjson.Fragment(orjson.dumps(build())))
+        _response_cache[key] = entry
+    response = standard_response(request, entry[1])
+    response.headers.update(headers)
+    return response
+
+
+def __getattr__(name: str) -> Any:
+    if name == "app":
+        global app
+        with startup_profiler.phase("create_app"):
+            app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 
-from ..core.backtest import run_backtest
 from ..main import standard_response
 
 router = APIRouter()
 
 
+def _options(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from ..core.backtest import DAY_SECONDS, DOWNSAMPLERS  # local import keeps numpy off the startup path
+
+    method = payload.get("downsample", "lttb")
+    return {
+        "strategy": payload.get("strategy", "dca"),
+        "days": int(payload.get("days", 30)),
+        "bar_seconds": int(payload.get("bar_seconds", DAY_SECONDS)),
+        "resolution": int(payload["resolution"]) if payload.get("resolution") else None,
+        "method": method if method in DOWNSAMPLERS else "lttb",
+    }
+
+
 @router.post("/backtest/run")
 async def backtest_run(request: Request, payload: Dict[str, Any]):
-    strategy = payload.get("strategy", "dca")
-    days = int(payload.get("days", 30))
-    result = run_backtest(strategy, days)
+    from ..core.backtest import run_backtest
+
+    result = await asyncio.to_thread(
+        run_backtest,
+        symbol=payload.get("symbol"),
+        columnar=payload.get("format") == "columnar",
+        **_options(payload),
+    )
     return standard_response(request, result)
+
+
+@router.post("/backtest/run.bin")
+async def backtest_run_binary(payload: Dict[str, Any]):
+    from ..core.backtest import run_backtest_binary
+
+    body, headers = await asyncio.to_thread(run_backtest_binary, **_options(payload))
+    return Response(content=body, media_type="application/octet-stream", headers=headers)
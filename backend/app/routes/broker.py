@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import math
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Request
 
+from ..broker.base import OrderError
 from ..broker.okx import okx_broker
+from ..broker.registry import broker_registry
+from ..broker.router import smart_router
+from ..core.conditional import conditional_engine
+from ..core.decision_cache import decision_cache
 from ..core.ws_hub import ws_hub
 from ..main import standard_response
 
@@ -19,7 +26,16 @@ async def okx_balance(request: Request):
 
 @router.post("/broker/okx/order")
 async def okx_order(request: Request, payload: Dict[str, Any]):
-    response = await okx_broker.place_order(payload)
+    try:
+        response = await okx_broker.place_order(payload)
+    except OrderError as exc:
+        return standard_response(
+            request,
+            ok=False,
+            error={"code": "order_failed", "message": str(exc)},
+            data=None,
+            status_code=502,
+        )
     await ws_hub.broadcast("orders", {"type": "order", "payload": response})
     return standard_response(request, response)
 
@@ -29,3 +45,100 @@ async def okx_simulate(request: Request, payload: Dict[str, Any]):
     response = await okx_broker.simulate_order(payload)
     await ws_hub.broadcast("orders", {"type": "simulate", "payload": response})
     return standard_response(request, response)
+
+
+def _invalid_order(request: Request, exc: ValueError):
+    return standard_response(
+        request,
+        ok=False,
+        error={"code": "invalid_order", "message": str(exc)},
+        data=None,
+        status_code=400,
+    )
+
+
+@router.get("/broker/conditional")
+async def conditional_list(request: Request, instId: Optional[str] = None):
+    return standard_response(request, conditional_engine.pending(instId))
+
+
+@router.post("/broker/conditional")
+async def conditional_create(request: Request, payload: Dict[str, Any]):
+    try:
+        trigger = await conditional_engine.add(payload)
+    except ValueError as exc:
+        return _invalid_order(request, exc)
+    return standard_response(request, asdict(trigger))
+
+
+@router.post("/broker/conditional/oco")
+async def conditional_oco(request: Request, payload: Dict[str, Any]):
+    try:
+        legs = await conditional_engine.add_oco(payload)
+    except ValueError as exc:
+        return _invalid_order(request, exc)
+    return standard_response(request, [asdict(leg) for leg in legs])
+
+
+@router.delete("/broker/conditional/{trigger_id}")
+async def conditional_cancel(request: Request, trigger_id: str):
+    cancelled = await conditional_engine.cancel(trigger_id)
+    if not cancelled:
+        return standard_response(
+            request,
+            ok=False,
+            error={"code": "not_found", "message": f"{trigger_id} is not pending"},
+            data=None,
+            status_code=404,
+        )
+    return standard_response(request, [asdict(item) for item in cancelled])
+
+
+@router.post("/broker/conditional/tick")
+async def conditional_tick(request: Request, payload: Dict[str, Any]):
+    symbol = payload.get("instId")
+    try:
+        price = float(payload.get("px"))
+    except (TypeError, ValueError):
+        price = math.nan
+    if not symbol or not isinstance(symbol, str):
+        return _invalid_order(request, ValueError("instId is required"))
+    if not math.isfinite(price) or price <= 0:
+        return _invalid_order(request, ValueError("px must be a positive number"))
+    decision_cache.market.observe(symbol, price)
+    fired = await conditional_engine.on_tick(symbol, price)
+    return standard_response(request, fired)
+
+
+@router.get("/broker/venues")
+async def broker_venues(request: Request):
+    return standard_response(request, broker_registry.status())
+
+
+def _venue_list(payload: Dict[str, Any]) -> Optional[List[str]]:
+    venues = payload.get("venues")
+    if isinstance(venues, str):
+        venues = [name.strip() for name in venues.split(",") if name.strip()]
+    return [str(name).upper() for name in venues] if venues else None
+
+
+@router.post("/broker/route/quote")
+async def route_quote(request: Request, payload: Dict[str, Any]):
+    try:
+        plan = await smart_router.plan(payload, _venue_list(payload))
+    except ValueError as exc:
+        return _invalid_order(request, exc)
+    return standard_response(request, asdict(plan))
+
+
+@router.post("/broker/route/order")
+async def route_order(request: Request, payload: Dict[str, Any]):
+    simulate = bool(payload.pop("simulate", False))
+    venues = _venue_list(payload)
+    payload.pop("venues", None)
+    try:
+        result = await smart_router.execute(payload, venues, simulate)
+    except ValueError as exc:
+        return _invalid_order(request, exc)
+    await ws_hub.broadcast("orders", {"type": "routed", "payload": result})
+    return standard_response(request, result)
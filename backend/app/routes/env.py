@@ -4,23 +4,21 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, Request
 
-from ..core.cost import cost_manager
 from ..core.env import env_manager
 from ..core.ws_hub import ws_hub
-from ..main import standard_response
+from ..main import cached_response, standard_response
 
 router = APIRouter()
 
 
 @router.get("/env")
 async def get_env(request: Request):
-    return standard_response(request, env_manager.masked_env())
+    return cached_response(request, "env", env_manager.version, env_manager.masked_env)
 
 
 @router.post("/env")
 async def update_env(request: Request, payload: Dict[str, Any]):
-    env_manager.update_env(payload)
-    cost_manager.update_limit()
+    await env_manager.update_env_async(payload)
     await ws_hub.broadcast("settings:update", {"type": "env", "payload": env_manager.masked_env()})
     return standard_response(request, env_manager.masked_env())
 
@@ -29,7 +27,7 @@ async def update_env(request: Request, payload: Dict[str, Any]):
 async def switch_mode(request: Request, payload: Dict[str, Any]):
     mode = payload.get("mode", "PAPER")
     try:
-        env_manager.switch_mode(mode)
+        await env_manager.switch_mode_async(mode)
     except ValueError as exc:
         return standard_response(
             request,
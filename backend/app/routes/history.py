@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Request
+
+from ..main import standard_response
+
+router = APIRouter()
+
+
+def _invalid(request: Request, exc: Exception, code: str = "invalid_request"):
+    return standard_response(
+        request,
+        ok=False,
+        error={"code": code, "message": str(exc)},
+        data=None,
+        status_code=400,
+    )
+
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [str(item) for item in value or []]
+
+
+@router.post("/history/backfill")
+async def history_backfill(request: Request, payload: Dict[str, Any]):
+    from ..core.history import backfiller  # local import keeps numpy off the startup path
+
+    try:
+        job = backfiller.start(
+            _as_list(payload.get("symbols")),
+            _as_list(payload.get("bars") or "1H"),
+            payload.get("start"),
+            payload.get("end"),
+            int(payload.get("concurrency", 4)),
+        )
+    except (TypeError, ValueError) as exc:
+        return _invalid(request, exc)
+    return standard_response(request, job)
+
+
+@router.get("/history/backfill")
+async def history_jobs(request: Request, job_id: Optional[str] = None):
+    from ..core.history import backfiller
+
+    if job_id:
+        job = backfiller.jobs.get(job_id)
+        if job is None:
+            return standard_response(
+                request,
+                ok=False,
+                error={"code": "not_found", "message": f"backfill job {job_id} not found"},
+                data=None,
+                status_code=404,
+            )
+        return standard_response(request, job)
+    return standard_response(request, list(backfiller.jobs.values()))
+
+
+@router.get("/history/gaps")
+async def history_gaps(request: Request, symbol: str, start: str, end: str, bar: str = "1H"):
+    from ..core.history import find_gaps, parse_time
+
+    try:
+        report = await asyncio.to_thread(find_gaps, symbol, bar, parse_time(start), parse_time(end))
+    except ValueError as exc:
+        return _invalid(request, exc)
+    return standard_response(request, report)
+
+
+@router.post("/history/export")
+async def history_export(request: Request, payload: Dict[str, Any]):
+    from ..core.export import export
+
+    params = {key: value for key, value in payload.items() if key not in ("kind", "format", "name")}
+    try:
+        summary = await asyncio.to_thread(
+            export,
+            payload.get("kind", "candles"),
+            payload.get("format", "csv"),
+            payload.get("name"),
+            **params,
+        )
+    except (TypeError, ValueError) as exc:
+        return _invalid(request, exc, "invalid_export")
+    return standard_response(request, summary)
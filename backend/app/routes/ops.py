@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 
 from ..core.cost import cost_manager
+from ..core.decision_cache import decision_cache
+from ..core.loop_monitor import MAX_PROFILE_SECONDS, loop_monitor
 from ..core.metrics import metrics_response
-from ..main import standard_response
+from ..core.startup import import_time_report, startup_profiler
+from ..main import cached_response, standard_response
 
 router = APIRouter()
 
@@ -16,4 +22,45 @@ async def ops_metrics():
 
 @router.get("/ops/cost")
 async def ops_cost(request: Request):
-    return standard_response(request, cost_manager.budget())
+    return cached_response(request, "ops-cost", cost_manager.version, cost_manager.budget)
+
+
+@router.get("/ops/decision-cache")
+async def ops_decision_cache(request: Request):
+    return standard_response(request, decision_cache.stats())
+
+
+@router.get("/ops/startup")
+async def ops_startup(request: Request, imports: bool = False):
+    report = startup_profiler.report()
+    if imports:
+        report["imports"] = await asyncio.to_thread(import_time_report)
+    return standard_response(request, report)
+
+
+@router.get("/ops/loop")
+async def ops_loop(request: Request):
+    return standard_response(request, loop_monitor.snapshot())
+
+
+@router.get("/ops/profile")
+async def ops_profile(request: Request, seconds: float = 5.0, interval_ms: float = 5.0, all_threads: bool = False):
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or not 1 <= interval_ms <= 1000:
+        return standard_response(
+            request,
+            ok=False,
+            error={
+                "code": "invalid_profile",
+                "message": f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}] and interval_ms in [1, 1000]",
+            },
+            status_code=400,
+        )
+    collapsed = await loop_monitor.profile(seconds, interval_ms / 1000, all_threads)
+    if collapsed is None:
+        return standard_response(
+            request,
+            ok=False,
+            error={"code": "profile_busy", "message": "A profile is already running"},
+            status_code=409,
+        )
+    return PlainTextResponse(collapsed)
@@ -5,14 +5,14 @@ from typing import Any, Dict
 from fastapi import APIRouter, Request
 
 from ..core.risk import risk_manager
-from ..main import standard_response
+from ..main import cached_response, standard_response
 
 router = APIRouter()
 
 
 @router.get("/risk/status")
 async def risk_status(request: Request):
-    return standard_response(request, risk_manager.status())
+    return cached_response(request, "risk-status", risk_manager.version, risk_manager.status)
 
 
 @router.post("/risk/config")
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 
-from ..core.sentiment import aggregate_sentiment
+from ..core.sentiment import aggregate_sentiment, ingest_file, rolling_sentiment, score_and_track
+from ..core.sentiment_store import sentiment_series
 from ..main import standard_response
 
 router = APIRouter()
@@ -15,3 +16,72 @@ async def sentiment_aggregate(request: Request, payload: Dict[str, Any]):
     text = payload.get("text", "")
     result = aggregate_sentiment(text)
     return standard_response(request, result)
+
+
+@router.post("/sentiment/batch")
+async def sentiment_batch(request: Request, payload: Dict[str, Any]):
+    documents = payload.get("documents", [])
+    results = await score_and_track(documents)
+    touched = sorted({symbol for result in results for symbol in result["symbols"]})
+    return standard_response(
+        request,
+        {
+            "results": results,
+            "symbols": {symbol: rolling_sentiment.snapshot(symbol) for symbol in touched},
+        },
+    )
+
+
+@router.get("/sentiment/rolling")
+async def sentiment_rolling(request: Request, symbol: Optional[str] = None):
+    if symbol:
+        return standard_response(request, rolling_sentiment.snapshot(symbol))
+    return standard_response(request, rolling_sentiment.all())
+
+
+@router.post("/sentiment/ingest")
+async def sentiment_ingest(request: Request, payload: Dict[str, Any]):
+    try:
+        summary = await ingest_file(payload.get("path", ""))
+    except ValueError as exc:
+        return standard_response(
+            request,
+            ok=False,
+            error={"code": "invalid_path", "message": str(exc), "hint": "Place files under storage/news"},
+            data=None,
+            status_code=400,
+        )
+    return standard_response(request, summary)
+
+
+@router.get("/sentiment/window")
+async def sentiment_window(request: Request, symbol: str, windows: str = "3600,86400"):
+    try:
+        seconds = [int(value) for value in windows.split(",") if value.strip()]
+    except ValueError:
+        seconds = []
+    if not seconds or any(value <= 0 for value in seconds):
+        return standard_response(
+            request,
+            ok=False,
+            error={"code": "invalid_window", "message": "windows must be positive integer seconds, comma separated"},
+            data=None,
+            status_code=400,
+        )
+    return standard_response(request, [sentiment_series.window(symbol, value) for value in seconds])
+
+
+@router.get("/sentiment/series")
+async def sentiment_series_buckets(
+    request: Request,
+    symbol: str,
+    resolution: str = Query("minute", pattern="^(minute|hour)$"),
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+):
+    return standard_response(request, sentiment_series.buckets(symbol, resolution, start, end))
+
+
+@router.post("/sentiment/compact")
+async def sentiment_compact(request: Request):
+    return standard_response(request, sentiment_series.compact())
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, Request
 
 from ..core.ai import ai_engine
 from ..core.scheduler import autopilot_controller
+from ..core.sentiment import rolling_sentiment
+from ..core.streaming import FeedRecordError, Tick, replay, strategy_runtime
 from ..core.ws_hub import ws_hub
-from ..main import standard_response
+from ..main import cached_response, standard_response
 
 router = APIRouter()
 
@@ -20,13 +22,14 @@ STRATEGIES = [
 
 @router.get("/strategy/list")
 async def strategy_list(request: Request):
-    return standard_response(request, STRATEGIES)
+    return cached_response(request, "strategy-list", 0, lambda: STRATEGIES)
 
 
 @router.post("/strategy/execute")
 async def strategy_execute(request: Request, payload: Dict[str, Any]):
     strategy = payload.get("strategy", "dca")
-    context = {"universe": payload.get("universe", ai_engine.universe)}
+    universe = payload.get("universe") or ai_engine.universe
+    context = {"universe": universe, "sentiment": rolling_sentiment.summary(universe)}
     decision = await ai_engine.decide(strategy, context)
     await ws_hub.broadcast("orders", {"type": "strategy", "payload": decision})
     return standard_response(request, decision)
@@ -49,4 +52,74 @@ async def autopilot_stop(request: Request):
 
 @router.get("/strategy/autopilot/status")
 async def autopilot_status(request: Request):
-    return standard_response(request, autopilot_controller.status())
+    return cached_response(
+        request,
+        "autopilot-status",
+        autopilot_controller.version,
+        autopilot_controller.status,
+    )
+
+
+def _invalid_stream(request: Request, code: str, exc: Exception):
+    return standard_response(
+        request,
+        ok=False,
+        error={"code": code, "message": str(exc)},
+        data=None,
+        status_code=400,
+    )
+
+
+@router.post("/strategy/stream/start")
+async def stream_start(request: Request, payload: Dict[str, Any] | None = None):
+    payload = payload or {}
+    window_ms = payload.get("batch_window_ms")
+    try:
+        state = await strategy_runtime.start(
+            payload.get("strategies") or {"breakout": {}, "momentum": {}},
+            batch_size=payload.get("batch_size"),
+            batch_window=window_ms / 1000 if window_ms is not None else None,
+        )
+    except (TypeError, ValueError) as exc:
+        return _invalid_stream(request, "invalid_stream", exc)
+    await ws_hub.broadcast("autopilot", {"type": "stream_start", "payload": state})
+    return standard_response(request, state)
+
+
+@router.post("/strategy/stream/stop")
+async def stream_stop(request: Request):
+    state = await strategy_runtime.stop()
+    await ws_hub.broadcast("autopilot", {"type": "stream_stop", "payload": state})
+    return standard_response(request, state)
+
+
+@router.get("/strategy/stream/status")
+async def stream_status(request: Request):
+    return standard_response(request, strategy_runtime.status())
+
+
+@router.post("/strategy/stream/tick")
+async def stream_tick(request: Request, payload: Dict[str, Any]):
+    raw: List[Dict[str, Any]] = payload.get("ticks") or [payload]
+    try:
+        ticks = [Tick.from_payload(item) for item in raw]
+        for tick in ticks:
+            await strategy_runtime.publish(tick)
+    except (TypeError, ValueError) as exc:
+        return _invalid_stream(request, "invalid_tick", exc)
+    except RuntimeError as exc:
+        return _invalid_stream(request, "stream_stopped", exc)
+    return standard_response(request, {"accepted": len(ticks)})
+
+
+@router.post("/strategy/stream/replay")
+async def stream_replay(request: Request, payload: Dict[str, Any]):
+    if not strategy_runtime.running:
+        return _invalid_stream(request, "stream_stopped", RuntimeError("streaming runtime is not running"))
+    try:
+        summary = await replay(payload.get("path", ""), float(payload.get("speed", 1.0)))
+    except FeedRecordError as exc:
+        return _invalid_stream(request, "invalid_record", exc)
+    except ValueError as exc:
+        return _invalid_stream(request, "invalid_path", exc)
+    return standard_response(request, summary)
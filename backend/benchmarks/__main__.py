@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from .runner import DEFAULT_THRESHOLD, HISTORY_PATH, compare, load_history, run
+
+
+def _print_comparison(rows) -> int:
+    regressions = 0
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['name']:<45} {'new':>12} {row['current_us']:>12.1f} us")
+            continue
+        marker = {"regression": "REGRESSION", "improvement": "faster"}.get(row["status"], "")
+        print(
+            f"{row['name']:<45} {row['baseline_us']:>12.1f} -> {row['current_us']:>12.1f} us "
+            f"{row['change'] * 100:>+7.1f}% {marker}"
+        )
+        regressions += row["status"] == "regression"
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Hot-path benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="run benchmarks and append results to the history file")
+    run_parser.add_argument("--only", help="substring filter on benchmark names")
+    run_parser.add_argument("--quick", action="store_true", help="fewer iterations for smoke runs")
+    run_parser.add_argument("--tag", help="label stored with this run")
+    compare_parser = sub.add_parser("compare", help="compare two runs from the history file")
+    compare_parser.add_argument("--baseline", type=int, default=-2, help="history index of the baseline run")
+    compare_parser.add_argument("--current", type=int, default=-1, help="history index of the current run")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        from . import cases  # noqa: F401 - registers benchmarks
+
+        entry = run(args.only, args.quick, args.tag)
+        print(f"saved {len(entry['results'])} results to {HISTORY_PATH}")
+        return 0
+
+    history = load_history()
+    if len(history) < 2:
+        print(f"need at least two runs in {HISTORY_PATH}")
+        return 2
+    rows = compare(history[args.current], history[args.baseline], args.threshold)
+    regressions = _print_comparison(rows)
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
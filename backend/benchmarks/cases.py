@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from app.broker.okx import OkxBroker, SigningContext
+from app.core import audit
+from app.core.ai import ai_engine
+from app.core.backtest import run_backtest
+from app.core.cost import cost_manager
+from app.core.decision_cache import decision_cache
+from app.core.env import env_manager
+from app.core.risk import RiskConfig, RiskManager, risk_manager
+from app.core.sentiment import LEXICON, aggregate_sentiment, score_batch
+from app.core.ws_hub import WebSocketHub
+
+from .runner import benchmark
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="ai-trading-bench-"))
+SYMBOLS = [f"SYM{i}-USDT" for i in range(64)]
+WORDS = list(LEXICON) + ["the", "market", "today", "bitcoin", "eth", "not", "price", "volume", ","] * 4
+
+
+def _isolate() -> None:
+    # keep benchmarks away from the real ledger, audit log and .env
+    cost_manager.path = SCRATCH_DIR / "cost_ledger.json"
+    audit.AUDIT_PATH = SCRATCH_DIR / "audit.log"
+    env_manager._apply({**env_manager.config.values, "AI_DAILY_COST_LIMIT_USD": "0", "AI_HOURLY_COST_LIMIT_USD": "0"})
+
+
+_isolate()
+
+
+for days, bar_seconds, label in ((365, 86400, "365d_daily"), (30, 3600, "30d_hourly"), (365, 60, "365d_minute")):
+    benchmark(f"backtest.run[{label}]", number=20 if bar_seconds == 60 else 200, days=days, bar_seconds=bar_seconds)(
+        lambda days, bar_seconds: run_backtest("dca", days, bar_seconds=bar_seconds)
+    )
+    benchmark(
+        f"backtest.run[{label},lttb2000]",
+        number=20 if bar_seconds == 60 else 200,
+        days=days,
+        bar_seconds=bar_seconds,
+    )(lambda days, bar_seconds: run_backtest("dca", days, bar_seconds=bar_seconds, resolution=2000))
+
+
+def _decide_setup() -> None:
+    risk_manager.config.cooldown_seconds = 0
+    decision_cache.clear()
+
+
+async def _decide(_: Any, universe: List[str]) -> Dict[str, Any]:
+    risk_manager.reset_day()
+    decision_cache.clear()
+    return await ai_engine.decide("bench", {"universe": universe})
+
+
+for size in (2, 8, 32):
+    benchmark(f"ai.decide[universe={size}]", number=200, setup=_decide_setup, universe=SYMBOLS[:size])(_decide)
+
+
+async def _decide_cached(_: Any, universe: List[str]) -> Dict[str, Any]:
+    risk_manager.reset_day()
+    return await ai_engine.decide("bench", {"universe": universe})
+
+
+benchmark("ai.decide[universe=8,cache_hit]", number=200, setup=_decide_setup, universe=SYMBOLS[:8])(_decide_cached)
+
+
+def _risk_setup() -> RiskManager:
+    manager = RiskManager(RiskConfig(cooldown_seconds=0))
+    for symbol in SYMBOLS:
+        manager.exposure[symbol] = random.uniform(0, 5000)
+    return manager
+
+
+@benchmark("risk.evaluate_order", number=20000, setup=_risk_setup)
+def _risk_evaluate(manager: RiskManager) -> None:
+    manager.evaluate_order("SYM7-USDT", 250.0)
+
+
+def _fake_okx(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"code": "0", "data": [{"ordId": "1", "sCode": "0"}]})
+
+
+def _broker_setup() -> OkxBroker:
+    broker = OkxBroker()
+    broker._client = httpx.AsyncClient(base_url="http://fake-okx.local", transport=httpx.MockTransport(_fake_okx))
+    broker._signing = SigningContext(api_key="bench-key", passphrase="bench", secret=b"bench-secret", simulated=True)
+    return broker
+
+
+@benchmark("okx.sign_headers", number=20000, setup=_broker_setup)
+def _okx_headers(broker: OkxBroker) -> None:
+    broker._headers("POST", "/api/v5/trade/order", '{"instId":"BTC-USDT","sz":"0.01"}')
+
+
+@benchmark("okx.place_order[fake_server]", number=500, setup=_broker_setup)
+async def _okx_place(broker: OkxBroker) -> None:
+    await broker.place_order({"instId": "BTC-USDT", "tdMode": "cash", "side": "buy", "ordType": "market", "sz": "0.01"})
+
+
+class FakeWebSocket:
+    async def send_json(self, message: dict) -> None:
+        return None
+
+
+def _hub_setup(clients: int):
+    async def setup() -> WebSocketHub:
+        hub = WebSocketHub()
+        for _ in range(clients):
+            await hub.register("orders", FakeWebSocket())
+        return hub
+
+    return setup
+
+
+for clients in (10, 100, 1000):
+    benchmark(f"ws.broadcast[clients={clients}]", number=200 if clients < 1000 else 50, setup=_hub_setup(clients))(
+        lambda hub: hub.broadcast("orders", {"type": "order", "payload": {"instId": "BTC-USDT", "sz": "0.01"}})
+    )
+
+
+def _corpus(size: int) -> List[str]:
+    rng = random.Random(size)
+    return [" ".join(rng.choice(WORDS) for _ in range(40)) for _ in range(size)]
+
+
+CORPUS_10K = _corpus(10000)
+
+
+@benchmark("sentiment.aggregate[single]", number=20000)
+def _sentiment_single() -> None:
+    aggregate_sentiment(CORPUS_10K[0])
+
+
+@benchmark("sentiment.score_batch[10k_docs]", number=3, repeat=3)
+def _sentiment_batch() -> None:
+    score_batch(CORPUS_10K)
+
+
+@benchmark("audit.log_event", number=5000)
+def _audit() -> None:
+    audit.log_event("bench", {"symbol": "BTC-USDT", "size": 100.0, "reasons": []})
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+HISTORY_PATH = ROOT_DIR / "exports" / "benchmarks" / "history.json"
+DEFAULT_THRESHOLD = 0.10
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[..., Any]
+    setup: Optional[Callable[[], Any]] = None
+    number: int = 100
+    repeat: int = 5
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, number: int = 100, repeat: int = 5, setup: Optional[Callable[[], Any]] = None, **params: Any):
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        REGISTRY.append(Benchmark(name, func, setup, number, repeat, params))
+        return func
+
+    return decorator
+
+
+async def _time_rounds(bench: Benchmark, number: int, repeat: int) -> List[float]:
+    state = bench.setup() if bench.setup else None
+    if inspect.isawaitable(state):
+        state = await state
+    args = (state,) if bench.setup else ()
+    is_async = inspect.isawaitable(probe := bench.func(*args, **bench.params))
+    if is_async:
+        await probe
+    rounds = []
+    for index in range(repeat + 1):
+        start = time.perf_counter()
+        if is_async:
+            for _ in range(number):
+                await bench.func(*args, **bench.params)
+        else:
+            for _ in range(number):
+                bench.func(*args, **bench.params)
+        elapsed = time.perf_counter() - start
+        if index:
+            rounds.append(elapsed / number)
+    return rounds
+
+
+def _summary(rounds: List[float], number: int) -> Dict[str, float]:
+    ordered = sorted(rounds)
+    median = statistics.median(ordered)
+    return {
+        "median_us": median * 1e6,
+        "min_us": ordered[0] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+        "stdev_us": statistics.pstdev(ordered) * 1e6,
+        "ops_per_sec": 1 / median if median else 0.0,
+        "number": number,
+        "rounds": len(rounds),
+    }
+
+
+async def run_all(only: Optional[str] = None, quick: bool = False) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for bench in REGISTRY:
+        if only and only not in bench.name:
+            continue
+        number = max(1, bench.number // 10) if quick else bench.number
+        repeat = 2 if quick else bench.repeat
+        rounds = await _time_rounds(bench, number, repeat)
+        results[bench.name] = _summary(rounds, number)
+        stats = results[bench.name]
+        print(f"{bench.name:<45} {stats['median_us']:>12.1f} us  {stats['ops_per_sec']:>12.1f} ops/s", flush=True)
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def load_history(path: Path = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def append_history(results: Dict[str, Dict[str, float]], tag: Optional[str] = None, path: Path = HISTORY_PATH) -> Dict[str, Any]:
+    entry = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "tag": tag,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    history = load_history(path)
+    history.append(entry)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+    return entry
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    rows = []
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            rows.append({"name": name, "status": "new", "current_us": stats["median_us"]})
+            continue
+        change = stats["median_us"] / base["median_us"] - 1 if base["median_us"] else 0.0
+        status = "ok"
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        rows.append({
+            "name": name,
+            "status": status,
+            "baseline_us": base["median_us"],
+            "current_us": stats["median_us"],
+            "change": change,
+        })
+    return rows
+
+
+def run(only: Optional[str] = None, quick: bool = False, tag: Optional[str] = None) -> Dict[str, Any]:
+    results = asyncio.run(run_all(only, quick))
+    return append_history(results, tag)
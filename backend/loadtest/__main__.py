@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .fake_okx import FakeOkxConfig
+from .feed import DEFAULT_SYMBOLS
+from .harness import LoadTestConfig, format_report, run_load_test, save_report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="End-to-end load test against a fake OKX")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--orders", type=int, default=8, help="concurrent order clients")
+    parser.add_argument("--strategies", type=int, default=4, help="concurrent strategy/execute clients")
+    parser.add_argument("--ws-clients", type=int, default=50, help="websocket subscribers on the orders channel")
+    parser.add_argument("--no-feed", action="store_true", help="do not relay ticker ticks into the app")
+    parser.add_argument("--autopilot-interval", type=int, default=1, help="autopilot interval in seconds")
+    parser.add_argument("--symbols", default=",".join(DEFAULT_SYMBOLS))
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--okx-port", type=int, default=8766)
+    parser.add_argument("--okx-latency-ms", type=float, default=20.0)
+    parser.add_argument("--okx-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--okx-error-rate", type=float, default=0.0, help="fraction of exchange calls answered with 503")
+    parser.add_argument("--okx-rate-limit", type=float, default=0.0, help="exchange requests per second, 0 disables")
+    parser.add_argument("--tick-interval", type=float, default=0.1, help="seconds between synthetic ticker rounds")
+    parser.add_argument("--output", help="report path, defaults to exports/loadtest/report-<ts>.json")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        duration=args.duration,
+        order_concurrency=args.orders,
+        strategy_concurrency=args.strategies,
+        ws_clients=args.ws_clients,
+        feed=not args.no_feed,
+        autopilot_interval=args.autopilot_interval,
+        symbols=[symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()],
+        app_port=args.app_port,
+        okx_port=args.okx_port,
+        okx=FakeOkxConfig(
+            latency_ms=args.okx_latency_ms,
+            jitter_ms=args.okx_jitter_ms,
+            error_rate=args.okx_error_rate,
+            rate_limit_per_sec=args.okx_rate_limit,
+            tick_interval=args.tick_interval,
+        ),
+    )
+    report = run_load_test(config)
+    print(format_report(report))
+    path = save_report(report, Path(args.output) if args.output else None)
+    print(f"report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import httpx
+
+from .stats import LatencyRecorder
+
+PayloadFactory = Callable[[], Optional[Dict[str, Any]]]
+
+
+def order_payload(symbols: Sequence[str], rng: random.Random) -> PayloadFactory:
+    def build() -> Dict[str, Any]:
+        return {
+            "instId": rng.choice(symbols),
+            "tdMode": "cash",
+            "side": rng.choice(("buy", "sell")),
+            "ordType": "market",
+            "sz": "0.01",
+            # send time travels with the order so ws clients can measure delivery latency
+            "clOrdId": f"lt{time.time_ns()}",
+        }
+
+    return build
+
+
+def strategy_payload(symbols: Sequence[str], rng: random.Random) -> PayloadFactory:
+    def build() -> Dict[str, Any]:
+        return {
+            "strategy": rng.choice(("dca", "breakout", "grid")),
+            "universe": rng.sample(list(symbols), k=min(3, len(symbols))),
+        }
+
+    return build
+
+
+async def http_driver(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    method: str,
+    path: str,
+    payload: PayloadFactory,
+    concurrency: int,
+    deadline: float,
+) -> None:
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload())
+            except httpx.HTTPError as exc:
+                recorder.error(type(exc).__name__)
+                continue
+            recorder.record(time.perf_counter() - start, response.status_code)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    recorder.finish()
+
+
+def _order_latency(message: Dict[str, Any]) -> Optional[float]:
+    payload = message.get("payload") or {}
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, list) or not data or not isinstance(data[0], dict):
+        return None
+    client_id = str(data[0].get("clOrdId", ""))
+    if not client_id.startswith("lt"):
+        return None
+    return (time.time_ns() - int(client_id[2:])) / 1e9
+
+
+async def ws_driver(url: str, recorder: LatencyRecorder, clients: int, deadline: float) -> None:
+    import websockets
+
+    async def client() -> None:
+        try:
+            async with websockets.connect(url, max_queue=None) as connection:
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        return
+                    try:
+                        raw = await asyncio.wait_for(connection.recv(), remaining)
+                    except asyncio.TimeoutError:
+                        return
+                    message = json.loads(raw)
+                    latency = _order_latency(message)
+                    if latency is None:
+                        recorder.statuses[message.get("type", "unknown")] += 1
+                    else:
+                        recorder.record(latency, message.get("type", "order"))
+        except (OSError, websockets.WebSocketException) as exc:
+            recorder.error(type(exc).__name__)
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    recorder.finish()
+
+
+async def feed_bridge(
+    okx_ws_url: str,
+    symbols: Sequence[str],
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    deadline: float,
+) -> None:
+    # relays exchange tickers into the streaming strategy runtime, like a market-data consumer would
+    import websockets
+
+    subscribe = {"op": "subscribe", "args": [{"channel": "tickers", "instId": symbol} for symbol in symbols]}
+    try:
+        async with websockets.connect(okx_ws_url) as connection:
+            await connection.send(json.dumps(subscribe))
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    raw = await asyncio.wait_for(connection.recv(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                ticks = [
+                    {"instId": tick["instId"], "px": tick["last"], "ts": tick["ts"]}
+                    for tick in json.loads(raw).get("data", [])
+                ]
+                if not ticks:
+                    continue
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/api/strategy/stream/tick", json={"ticks": ticks})
+                except httpx.HTTPError as exc:
+                    recorder.error(type(exc).__name__)
+                    continue
+                recorder.record(time.perf_counter() - start, response.status_code)
+            recorder.finish()
+    except (OSError, websockets.WebSocketException) as exc:
+        recorder.error(type(exc).__name__)
+        recorder.finish()
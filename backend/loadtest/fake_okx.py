@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
+
+from .feed import BASE_PRICES, PriceFeed
+
+BAR_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1H": 3600, "4H": 14400, "1D": 86400}
+BAR_OFFSET_MS = {"1D": 16 * 3600 * 1000}
+
+
+@dataclass
+class FakeOkxConfig:
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    rate_limit_per_sec: float = 0.0
+    tick_interval: float = 0.1
+    candle_gap_every: int = 0
+    listed_at_ms: int = 1577836800000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def create_fake_okx(config: FakeOkxConfig, feed: PriceFeed, seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI(title="Fake OKX")
+    rng = random.Random(seed)
+    bucket = TokenBucket(config.rate_limit_per_sec)
+    counters: Counter = Counter()
+    subscribers: Set[asyncio.Queue] = set()
+    tasks: List[asyncio.Task] = []
+    app.state.counters = counters
+
+    async def exchange_delay() -> None:
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    async def gate(request: Request) -> Optional[ORJSONResponse]:
+        counters["requests"] += 1
+        if not request.headers.get("OK-ACCESS-SIGN"):
+            counters["unsigned"] += 1
+            return ORJSONResponse(status_code=401, content={"code": "50113", "msg": "Invalid Sign", "data": []})
+        if not bucket.take():
+            counters["rate_limited"] += 1
+            return ORJSONResponse(status_code=429, content={"code": "50011", "msg": "Too Many Requests", "data": []})
+        await exchange_delay()
+        if config.error_rate and rng.random() < config.error_rate:
+            counters["errors"] += 1
+            return ORJSONResponse(status_code=503, content={"code": "50001", "msg": "Service temporarily unavailable", "data": []})
+        return None
+
+    @app.post("/api/v5/trade/order")
+    async def place_order(request: Request):
+        rejected = await gate(request)
+        if rejected is not None:
+            return rejected
+        payload: Dict[str, Any] = await request.json()
+        counters["orders"] += 1
+        order = {
+            "ordId": uuid.uuid4().hex[:16],
+            "clOrdId": payload.get("clOrdId", ""),
+            "tag": "",
+            "sCode": "0",
+            "sMsg": "Order placed",
+        }
+        return ORJSONResponse({"code": "0", "msg": "", "data": [order]})
+
+    @app.get("/api/v5/account/balance")
+    async def balance(request: Request):
+        rejected = await gate(request)
+        if rejected is not None:
+            return rejected
+        return ORJSONResponse({"code": "0", "data": [{"ccy": "USDT", "availBal": "100000", "cashBal": "100000"}]})
+
+    @app.get("/api/v5/market/ticker")
+    async def ticker(instId: str):
+        counters["requests"] += 1
+        await exchange_delay()
+        if instId not in feed.prices:
+            return ORJSONResponse({"code": "51001", "msg": "Instrument ID does not exist", "data": []})
+        price = feed.prices[instId]
+        return ORJSONResponse({"code": "0", "data": [{"instId": instId, "last": str(price), "ts": str(int(time.time() * 1000))}]})
+
+    @app.get("/api/v5/market/books")
+    async def books(instId: str, sz: int = 1):
+        counters["requests"] += 1
+        await exchange_delay()
+        if instId not in feed.prices:
+            return ORJSONResponse({"code": "51001", "msg": "Instrument ID does not exist", "data": []})
+        price = feed.prices[instId]
+        spread = price * 0.0001
+        asks = [[str(price + spread * (level + 1)), "1.5", "0", "3"] for level in range(max(sz, 1))]
+        bids = [[str(price - spread * (level + 1)), "1.5", "0", "3"] for level in range(max(sz, 1))]
+        return ORJSONResponse({"code": "0", "data": [{"asks": asks, "bids": bids, "ts": str(int(time.time() * 1000))}]})
+
+    @app.get("/api/v5/market/history-candles")
+    async def history_candles(instId: str, bar: str = "1m", after: Optional[int] = None, limit: int = 100):
+        counters["requests"] += 1
+        counters["history_candles"] += 1
+        if not bucket.take():
+            counters["rate_limited"] += 1
+            return ORJSONResponse(status_code=429, content={"code": "50011", "msg": "Too Many Requests", "data": []})
+        await exchange_delay()
+        if bar not in BAR_SECONDS:
+            return ORJSONResponse({"code": "51000", "msg": "Parameter bar error", "data": []})
+        step = BAR_SECONDS[bar] * 1000
+        offset = BAR_OFFSET_MS.get(bar, 0)
+        newest = ((after if after is not None else int(time.time() * 1000)) - 1 - offset) // step * step + offset
+        base = BASE_PRICES.get(instId, 100.0)
+        rows = []
+        for index in range(min(limit, 300)):
+            ts = newest - index * step
+            if ts < config.listed_at_ms:
+                break
+            if config.candle_gap_every and (ts // step) % config.candle_gap_every == 0:
+                continue
+            close = base * math.exp(0.05 * math.sin(ts / 3.6e8))
+            rows.append([str(ts), str(close * 0.999), str(close * 1.002), str(close * 0.997), str(close), "12.5", "0", "0", "1"])
+        return ORJSONResponse({"code": "0", "msg": "", "data": rows})
+
+    @app.get("/stats")
+    async def stats():
+        return ORJSONResponse(dict(counters))
+
+    async def pump() -> None:
+        async for ticks in feed.stream(config.tick_interval):
+            for queue in list(subscribers):
+                if queue.full():
+                    counters["ws_dropped"] += 1
+                    continue
+                queue.put_nowait(ticks)
+
+    @app.on_event("startup")
+    async def start_pump() -> None:
+        tasks.append(asyncio.create_task(pump()))
+
+    @app.on_event("shutdown")
+    async def stop_pump() -> None:
+        for task in tasks:
+            task.cancel()
+
+    @app.websocket("/ws/v5/public")
+    async def public_ws(websocket: WebSocket):
+        await websocket.accept()
+        message = await websocket.receive_json()
+        wanted = {arg.get("instId") for arg in message.get("args", []) if arg.get("channel") == "tickers"}
+        await websocket.send_json({"event": "subscribe", "args": message.get("args", [])})
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+
+        async def push() -> None:
+            while True:
+                for tick in await queue.get():
+                    if tick["instId"] in wanted:
+                        await websocket.send_json({"arg": {"channel": "tickers", "instId": tick["instId"]}, "data": [tick]})
+
+        subscribers.add(queue)
+        sender = asyncio.create_task(push())
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            return
+        finally:
+            subscribers.discard(queue)
+            sender.cancel()
+
+    return app
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+DEFAULT_SYMBOLS = ("BTC-USDT", "ETH-USDT", "SOL-USDT", "XRP-USDT", "DOGE-USDT", "ADA-USDT")
+BASE_PRICES = {"BTC-USDT": 65000.0, "ETH-USDT": 3200.0, "SOL-USDT": 150.0, "XRP-USDT": 0.6, "DOGE-USDT": 0.15}
+
+
+class PriceFeed:
+
+    def __init__(
+        self,
+        symbols: Sequence[str] = DEFAULT_SYMBOLS,
+        volatility: float = 0.0005,
+        jump_probability: float = 0.001,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.volatility = volatility
+        self.jump_probability = jump_probability
+        self.prices: Dict[str, float] = {symbol: BASE_PRICES.get(symbol, 100.0) for symbol in symbols}
+        self.ticks = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.prices)
+
+    def step(self, symbol: str) -> Dict[str, object]:
+        shock = self.rng.gauss(0.0, self.volatility)
+        if self.rng.random() < self.jump_probability:
+            shock += self.rng.choice((-1, 1)) * self.volatility * 20
+        price = self.prices[symbol] * math.exp(shock)
+        self.prices[symbol] = price
+        self.ticks += 1
+        spread = price * 0.0001
+        return {
+            "instId": symbol,
+            "last": price,
+            "bidPx": price - spread,
+            "askPx": price + spread,
+            "ts": int(time.time() * 1000),
+        }
+
+    def tick_all(self) -> List[Dict[str, object]]:
+        return [self.step(symbol) for symbol in self.prices]
+
+    async def stream(self, interval: float = 0.1) -> AsyncIterator[List[Dict[str, object]]]:
+        while True:
+            yield self.tick_all()
+            await asyncio.sleep(interval)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from .drivers import feed_bridge, http_driver, order_payload, strategy_payload, ws_driver
+from .fake_okx import FakeOkxConfig, create_fake_okx
+from .feed import DEFAULT_SYMBOLS, PriceFeed
+from .stats import LatencyRecorder, LoopLagMonitor
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+REPORT_DIR = ROOT_DIR / "exports" / "loadtest"
+
+
+@dataclass
+class LoadTestConfig:
+    duration: float = 30.0
+    order_concurrency: int = 8
+    strategy_concurrency: int = 4
+    ws_clients: int = 50
+    feed: bool = True
+    autopilot_interval: int = 1
+    symbols: List[str] = field(default_factory=lambda: list(DEFAULT_SYMBOLS))
+    host: str = "127.0.0.1"
+    app_port: int = 8765
+    okx_port: int = 8766
+    seed: Optional[int] = 7
+    okx: FakeOkxConfig = field(default_factory=FakeOkxConfig)
+
+
+class ServerThread:
+    def __init__(self, app: Any, host: str, port: int) -> None:
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on"))
+        self.thread = threading.Thread(target=self.server.run, name=f"uvicorn-{port}", daemon=True)
+
+    def start(self, timeout: float = 15.0) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"server on port {self.server.config.port} failed to start")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=15.0)
+
+
+def _configure_app(config: LoadTestConfig, scratch: Path) -> None:
+    from app.core import audit
+    from app.core.conditional import conditional_engine
+    from app.core.cost import cost_manager
+    from app.core.env import env_manager
+
+    # point the broker at the fake exchange without touching .env or the real storage files
+    cost_manager.path = scratch / "cost_ledger.json"
+    conditional_engine.path = scratch / "conditional_orders.json"
+    audit.AUDIT_PATH = scratch / "audit.log"
+    env_manager._apply({
+        **env_manager.config.values,
+        "MODE": "PAPER",
+        "OKX_BASE_URL": f"http://{config.host}:{config.okx_port}",
+        "OKX_API_KEY_PAPER": "loadtest-key",
+        "OKX_API_SECRET_PAPER": "loadtest-secret",
+        "OKX_API_PASSPHRASE_PAPER": "loadtest",
+        "AI_DAILY_COST_LIMIT_USD": "0",
+        "AI_HOURLY_COST_LIMIT_USD": "0",
+    })
+
+
+async def _drive(config: LoadTestConfig, app_url: str, okx_url: str) -> Dict[str, Any]:
+    rng = random.Random(config.seed)
+    driver_lag = LoopLagMonitor()
+    driver_lag.start()
+    recorders = {
+        "orders": LatencyRecorder("POST /api/broker/okx/order"),
+        "strategy": LatencyRecorder("POST /api/strategy/execute"),
+        "ws": LatencyRecorder("WS /ws?channel=orders"),
+        "feed": LatencyRecorder("POST /api/strategy/stream/tick"),
+    }
+    limits = httpx.Limits(max_connections=config.order_concurrency + config.strategy_concurrency + 4)
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=30.0) as client:
+        autopilot = await client.post("/api/strategy/autopilot/start", json={"interval": config.autopilot_interval})
+        autopilot.raise_for_status()
+        if config.feed:
+            (await client.post("/api/strategy/stream/start", json={})).raise_for_status()
+        deadline = time.perf_counter() + config.duration
+        ws_url = app_url.replace("http", "ws", 1) + "/ws?channel=orders"
+        tasks = [
+            http_driver(client, recorders["orders"], "POST", "/api/broker/okx/order",
+                        order_payload(config.symbols, rng), config.order_concurrency, deadline),
+            http_driver(client, recorders["strategy"], "POST", "/api/strategy/execute",
+                        strategy_payload(config.symbols, rng), config.strategy_concurrency, deadline),
+        ]
+        if config.ws_clients:
+            tasks.append(ws_driver(ws_url, recorders["ws"], config.ws_clients, deadline))
+        if config.feed:
+            okx_ws_url = okx_url.replace("http", "ws", 1) + "/ws/v5/public"
+            tasks.append(feed_bridge(okx_ws_url, config.symbols, client, recorders["feed"], deadline))
+        await asyncio.gather(*tasks)
+        await client.post("/api/strategy/autopilot/stop")
+        autopilot_state = (await client.get("/api/strategy/autopilot/status")).json().get("data")
+        stream_state = (await client.post("/api/strategy/stream/stop")).json().get("data")
+    async with httpx.AsyncClient(base_url=okx_url) as okx_client:
+        exchange = (await okx_client.get("/stats")).json()
+    await driver_lag.stop()
+    return {
+        "scenarios": {name: {"target": rec.name, **rec.report()} for name, rec in recorders.items() if rec.samples or rec.errors or rec.statuses},
+        "autopilot": autopilot_state,
+        "stream": stream_state,
+        "exchange": exchange,
+        "driver_loop": driver_lag.report(),
+    }
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    from app.main import create_app
+
+    scratch = Path(tempfile.mkdtemp(prefix="ai-trading-loadtest-"))
+    _configure_app(config, scratch)
+    feed = PriceFeed(config.symbols, seed=config.seed)
+    okx_server = ServerThread(create_fake_okx(config.okx, feed, config.seed), config.host, config.okx_port)
+
+    app = create_app()
+    app_lag = LoopLagMonitor()
+    app.router.add_event_handler("startup", app_lag.start)
+    app.router.add_event_handler("shutdown", app_lag.stop)
+    app_server = ServerThread(app, config.host, config.app_port)
+
+    okx_server.start()
+    app_server.start()
+    try:
+        result = asyncio.run(_drive(config, f"http://{config.host}:{config.app_port}", f"http://{config.host}:{config.okx_port}"))
+    finally:
+        app_server.stop()
+        okx_server.stop()
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "config": asdict(config),
+        "app_loop": app_lag.report(),
+        "feed_ticks": feed.ticks,
+        **result,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = REPORT_DIR / f"report-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    return path
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{'scenario':<36} {'count':>8} {'rps':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  errors"]
+    for scenario in report["scenarios"].values():
+        latency = scenario["latency_ms"]
+        lines.append(
+            f"{scenario['target']:<36} {scenario['count']:>8} {scenario['throughput_per_sec']:>9.1f} "
+            f"{latency['p50']:>8.1f} {latency['p90']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}  "
+            f"{scenario['errors'] or ''}"
+        )
+    for name in ("app_loop", "driver_loop"):
+        lag = report[name]["lag_ms"]
+        lines.append(f"{name + ' lag (ms)':<36} {report[name]['samples']:>8} {'':>9} {lag['p50']:>8.1f} {lag['p90']:>8.1f} {lag['p99']:>8.1f} {lag['max']:>8.1f}")
+    lines.append(f"exchange: {report['exchange']}")
+    return "\n".join(lines)
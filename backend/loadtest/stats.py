@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    summary = {f"p{pct:g}": percentile(ordered, pct) * 1000 for pct in PERCENTILES}
+    summary["max"] = ordered[-1] * 1000 if ordered else 0.0
+    summary["mean"] = sum(ordered) / len(ordered) * 1000 if ordered else 0.0
+    return summary
+
+
+class LatencyRecorder:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.samples: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, seconds: float, status: Any = "ok") -> None:
+        self.samples.append(seconds)
+        self.statuses[str(status)] += 1
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] += 1
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "count": len(self.samples),
+            "errors": dict(self.errors),
+            "statuses": dict(self.statuses),
+            "throughput_per_sec": len(self.samples) / elapsed if elapsed else 0.0,
+            "latency_ms": summarize(self.samples),
+        }
+
+
+class LoopLagMonitor:
+    # how late the loop wakes a sleeper scheduled every `interval` seconds
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - expected, 0.0))
+
+    def report(self) -> Dict[str, Any]:
+        return {"samples": len(self.samples), "lag_ms": summarize(self.samples)}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.broker import registry
+from app.broker.base import OrderError
+from app.core import conditional
+from app.core.conditional import ConditionalOrderEngine
+
+
+class FailingBroker:
+    name = "FAILING"
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.orders = []
+
+    async def place_order(self, payload):
+        self.orders.append(payload)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def _quiet_audit(monkeypatch):
+    monkeypatch.setattr(conditional, "log_event", lambda *args, **kwargs: None)
+
+
+def _run(engine, broker, monkeypatch, *ticks):
+    monkeypatch.setattr(registry.broker_registry, "active", lambda: broker)
+
+    async def scenario():
+        legs = await engine.add_oco({"instId": "BTC-USDT", "side": "sell", "sz": "1", "takeProfit": 120, "stopLoss": 90})
+        results = [await engine.on_tick("BTC-USDT", price) for price in ticks]
+        return legs, results
+
+    return asyncio.run(scenario())
+
+
+def test_failed_placement_restores_trigger_and_sibling(tmp_path, monkeypatch):
+    path = tmp_path / "conditional.json"
+    engine = ConditionalOrderEngine(path)
+    broker = FailingBroker([OrderError("order not sent: ConnectError")])
+    legs, results = _run(engine, broker, monkeypatch, 85)
+
+    assert results[0][0]["error"] == "order not sent: ConnectError"
+    pending = {item["id"]: item for item in engine.pending()}
+    assert set(pending) == {leg.id for leg in legs}
+    assert all(item["status"] == "pending" for item in pending.values())
+    stop = next(leg for leg in legs if leg.kind == "stop_loss")
+    assert pending[stop.id]["error"] == "order not sent: ConnectError"
+    assert {item["id"] for item in json.loads(path.read_text())} == set(pending)
+
+
+def test_rejected_order_body_is_not_treated_as_filled(tmp_path, monkeypatch):
+    engine = ConditionalOrderEngine(tmp_path / "conditional.json")
+    rejected = {"code": "1", "msg": "", "data": [{"sCode": "51008", "sMsg": "Insufficient balance"}]}
+    broker = FailingBroker([rejected, {"code": "0", "data": [{"ordId": "1", "sCode": "0"}]}])
+    legs, results = _run(engine, broker, monkeypatch, 85, 85)
+
+    assert results[0][0]["error"] == "Insufficient balance"
+    assert "broker_response" in results[1][0]
+    assert engine.pending() == []
+    assert len(broker.orders) == 2
+
+
+def test_trailing_updates_are_written_once_after_delay(tmp_path, monkeypatch):
+    path = tmp_path / "conditional.json"
+    engine = ConditionalOrderEngine(path)
+    monkeypatch.setattr(conditional, "TRAIL_PERSIST_DELAY_SECONDS", 0.01)
+
+    async def scenario():
+        await engine.add({"instId": "SOL-USDT", "kind": "trailing_stop", "sz": "1", "trailPct": 0.1, "refPx": 100})
+        for price in (110, 120, 150):
+            await engine.on_tick("SOL-USDT", price)
+        before = json.loads(path.read_text())[0]["trigger_px"]
+        await asyncio.sleep(0.05)
+        return before, json.loads(path.read_text())[0]["trigger_px"]
+
+    before, after = asyncio.run(scenario())
+    assert before == 90
+    assert after == 135
@@ -2,7 +2,8 @@ import { api, type ApiResponse } from "./client"
 
 export type BacktestResult = {
   strategy: string
-  equity: { ts: string; value: number }[]
+  equity: { ts: number; value: number }[]
+  points: { source: number; returned: number }
   kpi: {
     total_return: number
     sharpe: number
@@ -10,7 +11,11 @@ export type BacktestResult = {
   }
 }
 
-export const runBacktest = async (payload: { strategy: string; days: number }) => {
-  const res = await api.post("api/backtest/run", { json: payload }).json<ApiResponse<BacktestResult>>()
+export const CHART_RESOLUTION = 2000
+
+export const runBacktest = async (payload: { strategy: string; days: number; resolution?: number }) => {
+  const res = await api
+    .post("api/backtest/run", { json: { resolution: CHART_RESOLUTION, ...payload } })
+    .json<ApiResponse<BacktestResult>>()
   return res.data
 }
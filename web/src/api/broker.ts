@@ -16,3 +16,10 @@ export const simulateOrder = async (payload: Record<string, any>) => {
     .json<ApiResponse<any>>()
   return res.data
 }
+
+export const createOco = async (payload: Record<string, any>) => {
+  const res = await api
+    .post("api/broker/conditional/oco", { json: payload })
+    .json<ApiResponse<any>>()
+  return res.data
+}
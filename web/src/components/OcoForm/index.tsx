@@ -1,5 +1,5 @@
 import { useState } from "react"
-import { simulateOrder } from "../../api/broker"
+import { createOco } from "../../api/broker"
 
 export function OcoForm() {
   const [form, setForm] = useState({
@@ -15,26 +15,19 @@ export function OcoForm() {
   }
 
   const handleSubmit = async () => {
-    const tp = await simulateOrder({
+    const legs = await createOco({
       instId: form.instId,
       side: "sell",
-      ordType: "limit",
-      px: form.takeProfit,
       sz: form.size,
+      takeProfit: form.takeProfit,
+      stopLoss: form.stopLoss,
     })
-    const sl = await simulateOrder({
-      instId: form.instId,
-      side: "sell",
-      ordType: "stop",
-      px: form.stopLoss,
-      sz: form.size,
-    })
-    setResponse({ takeProfit: tp, stopLoss: sl })
+    setResponse(legs)
   }
 
   return (
     <div className="rounded-xl border border-slate-800 bg-slate-900/60 p-4">
-      <h3 className="text-lg font-semibold">OCO Simulator</h3>
+      <h3 className="text-lg font-semibold">OCO Order</h3>
       <div className="mt-3 grid gap-3">
         <label className="text-xs uppercase text-slate-400">
           Instrument
@@ -72,7 +65,7 @@ export function OcoForm() {
         </label>
       </div>
       <button className="mt-4 rounded-lg bg-slate-800 px-3 py-2 text-sm" onClick={handleSubmit}>
-        Simulate OCO
+        Place OCO
       </button>
       {response && (
         <pre className="mt-4 max-h-48 overflow-y-auto rounded bg-slate-950/60 p-3 text-xs text-emerald-200">